@@ -0,0 +1,58 @@
+"""TuyaCipher encrypt and decrypt throughput.
+
+Run from the repository root:
+
+    python benchmarks/bench_cipher.py [--rounds 20000] [--root PATH]
+
+Encrypts and decrypts 64 B, 1 KB and 16 KB payloads with protocol 3.1 and
+3.3 ciphers and reports the time per round trip. Point --root at a checkout
+of an earlier revision to compare; revisions whose package imports Home
+Assistant need it installed.
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_KEY = "0123456789abcdef"
+SIZES = (64, 1024, 16384)
+
+
+def measure(tuyalocalapi, rounds):
+    command = tuyalocalapi.Message.GET_COMMAND
+    results = []
+    for version in ((3, 1), (3, 3)):
+        cipher = tuyalocalapi.TuyaCipher(LOCAL_KEY, version)
+        for size in SIZES:
+            data = bytes(range(256)) * (size // 256) or bytes(size)
+            assert cipher.decrypt(command, cipher.encrypt(command, data)) == data
+            count = max(rounds * 64 // size, 100)
+            start = time.perf_counter()
+            for _ in range(count):
+                cipher.decrypt(command, cipher.encrypt(command, data))
+            elapsed = time.perf_counter() - start
+            results.append((version, size, elapsed / count))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--root", type=Path, default=ROOT)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(args.root))
+    tuyalocalapi = importlib.import_module("custom_components.robovac.tuyalocalapi")
+    for version, size, per_round in measure(tuyalocalapi, args.rounds):
+        print(
+            "  {}.{} {:>6} B: {:7.2f} us per encrypt+decrypt".format(
+                *version, size, per_round * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Consumables decoding: ast.literal_eval on every update against the decoder.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/bench_consumables.py [--updates 100000]
+
+Decodes the same consumables DPS value --updates times, as an entity does
+while the value is unchanged, with the old ast.literal_eval path, with the
+uncached parser, and with decode_consumables.
+"""
+
+import argparse
+import ast
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DURATIONS = {"SB": 1125, "RB": 2250, "FM": 960, "SP": 1800, "SS": 1800, "TR": 300}
+
+
+def literal_eval_path(raw):
+    consumables = ast.literal_eval(base64.b64decode(raw).decode("ascii"))
+    if "consumable" in consumables and "duration" in consumables["consumable"]:
+        return consumables["consumable"]["duration"]
+    return None
+
+
+def rate(decode, raw, updates):
+    start = time.perf_counter()
+    for _ in range(updates):
+        decode(raw)
+    return (time.perf_counter() - start) / updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=100000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from custom_components.robovac.vacuum import (
+        _decode_consumables,
+        decode_consumables,
+    )
+
+    raw = base64.b64encode(
+        json.dumps({"consumable": {"duration": DURATIONS}}).encode("ascii")
+    ).decode("ascii")
+    assert literal_eval_path(raw) == DURATIONS
+
+    print("{} updates of an unchanged consumables value".format(args.updates))
+    for name, decode in (
+        ("ast.literal_eval", literal_eval_path),
+        ("parser, uncached", _decode_consumables.__wrapped__),
+        ("decode_consumables", decode_consumables),
+    ):
+        per_update = rate(decode, raw, args.updates)
+        print("  {}: {:.2f} us per update".format(name, per_update * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Frame encode and decode throughput.
+
+Run from the repository root:
+
+    python benchmarks/bench_crc.py [--size 256] [--frames 20000] [--root PATH]
+
+Builds and parses protocol 3.3 frames with an unencrypted JSON payload of
+--size bytes, once with the checksum the module selected and once with the
+table implementation, and reports frames per second for each. Point --root
+at a checkout of an earlier revision to compare; revisions whose package
+imports Home Assistant need it installed.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_KEY = "0123456789abcdef"
+
+
+def rate(function, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        function()
+    return frames / (time.perf_counter() - start)
+
+
+async def measure(tuyalocalapi, size, frames):
+    device = SimpleNamespace(
+        version=(3, 3), cipher=tuyalocalapi.TuyaCipher(LOCAL_KEY, (3, 3))
+    )
+    payload = {"dps": {"1": "x" * max(size - 20, 0)}}
+    message = tuyalocalapi.Message(
+        tuyalocalapi.Message.GET_COMMAND,
+        payload,
+        sequence=1,
+        device=device,
+        expect_response=False,
+    )
+    frame = message.bytes()
+    decoded = tuyalocalapi.Message.from_bytes(device, frame, device.cipher)
+    assert decoded.payload == json.loads(json.dumps(payload))
+
+    results = {}
+    selected = tuyalocalapi.crc
+    for name, checksum in (
+        (getattr(selected, "__name__", "crc"), selected),
+        ("table_crc", getattr(tuyalocalapi, "table_crc", selected)),
+    ):
+        tuyalocalapi.crc = checksum
+        results[name] = (
+            rate(message.bytes, frames),
+            rate(
+                lambda: tuyalocalapi.Message.from_bytes(device, frame, device.cipher),
+                frames,
+            ),
+        )
+    tuyalocalapi.crc = selected
+    return len(frame), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--root", type=Path, default=ROOT)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(args.root))
+    tuyalocalapi = importlib.import_module("custom_components.robovac.tuyalocalapi")
+    frame_size, results = asyncio.run(measure(tuyalocalapi, args.size, args.frames))
+    print("{} byte frames, {} of each".format(frame_size, args.frames))
+    for name, (encode, decode) in results.items():
+        print(
+            "  {}: encode {:,.0f} frames/s, decode {:,.0f} frames/s".format(
+                name, encode, decode
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Import time of the protocol modules, from python -X importtime.
+
+Run from the repository root:
+
+    python benchmarks/bench_import.py [module] [runs]
+
+Reports the median time to import the module (default
+custom_components.robovac.robovac) in a fresh interpreter, how many modules
+it pulled in, and whether Home Assistant was among them.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def measure(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = set()
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        imported.add(name.strip())
+        # top-level imports (one space of indent) include their nested ones
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total, imported
+
+
+def main():
+    module = sys.argv[1] if len(sys.argv) > 1 else "custom_components.robovac.robovac"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    samples = []
+    for _ in range(runs):
+        total, imported = measure(module)
+        samples.append(total)
+    homeassistant = sorted(name for name in imported if name.startswith("homeassistant"))
+    print("import {}".format(module))
+    print("  median {:.1f} ms over {} runs".format(statistics.median(samples) / 1000, runs))
+    print("  modules imported: {}".format(len(imported)))
+    print("  homeassistant modules: {}".format(len(homeassistant)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Idle cost of the per-device send queue.
+
+Run from the repository root:
+
+    python benchmarks/bench_queue_idle.py [--devices 12] [--seconds 5] [--root PATH]
+
+Creates TuyaDevices that are never connected and have nothing queued, then
+reports the tasks created and the CPU time used while they sit idle. Point
+--root at a checkout of an earlier revision to compare; revisions whose
+package imports Home Assistant need it installed.
+"""
+
+import argparse
+import asyncio
+import importlib
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_KEY = "0123456789abcdef"
+
+
+async def measure(tuyalocalapi, devices, seconds):
+    loop = asyncio.get_running_loop()
+    created = 0
+
+    def counting_factory(loop, coro, **kwargs):
+        nonlocal created
+        created += 1
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    model_details = SimpleNamespace(commands={})
+    fleet = [
+        tuyalocalapi.TuyaDevice(
+            model_details,
+            "device{}".format(i),
+            "127.0.0.1",
+            5,
+            10,
+            None,
+            local_key=LOCAL_KEY,
+        )
+        for i in range(devices)
+    ]
+    # let every consumer start before measuring
+    await asyncio.sleep(0.5)
+
+    loop.set_task_factory(counting_factory)
+    cpu = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu = time.process_time() - cpu
+    loop.set_task_factory(None)
+    return len(fleet), created, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--root", type=Path, default=ROOT)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(args.root))
+    tuyalocalapi = importlib.import_module("custom_components.robovac.tuyalocalapi")
+    devices, created, cpu = asyncio.run(
+        measure(tuyalocalapi, args.devices, args.seconds)
+    )
+    print("{} idle devices for {:g} s".format(devices, args.seconds))
+    print("  tasks created: {} ({:.1f}/s)".format(created, created / args.seconds))
+    print("  CPU time: {:.1f} ms ({:.2f} ms/s)".format(cpu * 1000, cpu * 1000 / args.seconds))
+
+
+if __name__ == "__main__":
+    main()
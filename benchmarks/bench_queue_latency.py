@@ -0,0 +1,102 @@
+"""Command-to-wire latency behind a saturated send queue.
+
+Run from the repository root:
+
+    python benchmarks/bench_queue_latency.py [--backlog 20] [--trials 5] [--root PATH]
+
+Connects a TuyaDevice to a local server, fills its send queue with --backlog
+state requests, then issues a SET and reports how long it takes for the SET
+to reach the server. Point --root at a checkout of an earlier revision to
+compare; revisions whose package imports Home Assistant need it installed.
+"""
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import struct
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_KEY = "0123456789abcdef"
+
+
+async def trial(tuyalocalapi, backlog):
+    Message = tuyalocalapi.Message
+    header_size = struct.calcsize(tuyalocalapi.MESSAGE_PREFIX_FORMAT)
+    arrived = asyncio.get_running_loop().create_future()
+
+    async def serve(reader, writer):
+        try:
+            while True:
+                header = await reader.readexactly(header_size)
+                _, _, command, size = struct.unpack(
+                    tuyalocalapi.MESSAGE_PREFIX_FORMAT, header
+                )
+                await reader.readexactly(size)
+                if command == Message.SET_COMMAND and not arrived.done():
+                    arrived.set_result(time.perf_counter())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    device = tuyalocalapi.TuyaDevice(
+        SimpleNamespace(commands={}),
+        "device",
+        "127.0.0.1",
+        5,
+        600,
+        None,
+        local_key=LOCAL_KEY,
+        port=port,
+    )
+    await device.async_connect()
+    enqueue = getattr(device, "enqueue", device._queue.append)
+    payload = {"gwId": device.gateway_id, "devId": device.device_id}
+    for _ in range(backlog):
+        enqueue(
+            Message(
+                Message.GET_COMMAND,
+                payload,
+                encrypt=True,
+                device=device,
+                expect_response=False,
+            )
+        )
+
+    start = time.perf_counter()
+    await device.async_set({"1": True})
+    latency = await asyncio.wait_for(arrived, 60) - start
+    await device.async_disable()
+    server.close()
+    return latency
+
+
+async def measure(tuyalocalapi, backlog, trials):
+    return [await trial(tuyalocalapi, backlog) for _ in range(trials)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backlog", type=int, default=20)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--root", type=Path, default=ROOT)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(args.root))
+    tuyalocalapi = importlib.import_module("custom_components.robovac.tuyalocalapi")
+    latencies = asyncio.run(measure(tuyalocalapi, args.backlog, args.trials))
+    print("SET behind {} queued GETs, {} trials".format(args.backlog, args.trials))
+    print(
+        "  command-to-wire: median {:.0f} ms, max {:.0f} ms".format(
+            statistics.median(latencies) * 1000, max(latencies) * 1000
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Fleet startup against simulated vacuums.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py [--devices 100] [--handshake 0.05]
+
+Starts --devices TuyaDevices against one local server that answers state
+requests and pings like a vacuum, and has each read its state once, as the
+coordinator's warm-up does. Every TCP handshake is made to take
+--handshake seconds. Reports the time until every device has its state and
+the peak number of connects in progress, once with the FleetScheduler
+(startup window and shared connect slots) and once with every device
+starting at the same instant.
+"""
+
+import argparse
+import asyncio
+import json
+import struct
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_KEY = "0123456789abcdef"
+
+
+def make_server(tuyalocalapi):
+    Message = tuyalocalapi.Message
+    cipher = tuyalocalapi.TuyaCipher(LOCAL_KEY, (3, 3))
+    header_size = struct.calcsize(tuyalocalapi.MESSAGE_PREFIX_FORMAT)
+    state = json.dumps({"dps": {"15": "standby", "104": 100}}).encode()
+
+    def reply(sequence, command, payload):
+        # replies carry a zero return code ahead of the payload
+        payload = b"\0\0\0\0" + payload
+        header = struct.pack(
+            tuyalocalapi.MESSAGE_PREFIX_FORMAT,
+            tuyalocalapi.MAGIC_PREFIX,
+            sequence,
+            command,
+            len(payload) + 8,
+        )
+        checksum = tuyalocalapi.crc(header + payload)
+        return (
+            header
+            + payload
+            + struct.pack(
+                tuyalocalapi.MESSAGE_SUFFIX_FORMAT, checksum, tuyalocalapi.MAGIC_SUFFIX
+            )
+        )
+
+    async def serve(reader, writer):
+        try:
+            while True:
+                header = await reader.readexactly(header_size)
+                _, sequence, command, size = struct.unpack(
+                    tuyalocalapi.MESSAGE_PREFIX_FORMAT, header
+                )
+                await reader.readexactly(size)
+                if command == Message.GET_COMMAND:
+                    payload = cipher.encrypt(command, state)
+                else:
+                    payload = b""
+                writer.write(reply(sequence, command, payload))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    return serve
+
+
+async def start(tuyalocalapi, scheduler_module, devices, handshake, scheduled):
+    server = await asyncio.start_server(make_server(tuyalocalapi), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    connecting = peak = 0
+    open_connection = asyncio.open_connection
+
+    async def slow_open_connection(*args, **kwargs):
+        nonlocal connecting, peak
+        connecting += 1
+        peak = max(peak, connecting)
+        try:
+            await asyncio.sleep(handshake)
+            return await open_connection(*args, **kwargs)
+        finally:
+            connecting -= 1
+
+    scheduler = scheduler_module.FleetScheduler()
+    fleet = []
+    for i in range(devices):
+        device_id = "vacuum{:03}".format(i)
+        scheduler.register(device_id)
+        fleet.append(
+            tuyalocalapi.TuyaDevice(
+                SimpleNamespace(commands={}),
+                device_id,
+                "127.0.0.1",
+                5,
+                10,
+                None,
+                local_key=LOCAL_KEY,
+                port=port,
+                connect_slots=scheduler.connect_slots if scheduled else None,
+                phase=scheduler.phase(device_id) if scheduled else 0.0,
+            )
+        )
+
+    async def warm_up(device):
+        if scheduled:
+            await asyncio.sleep(scheduler.startup_delay(device.device_id))
+        while True:
+            try:
+                await device.async_get()
+                return
+            except Exception:
+                await asyncio.sleep(1)
+
+    asyncio.open_connection = slow_open_connection
+    try:
+        begin = time.perf_counter()
+        await asyncio.gather(*(warm_up(device) for device in fleet))
+        elapsed = time.perf_counter() - begin
+    finally:
+        asyncio.open_connection = open_connection
+
+    for device in fleet:
+        await device.async_disable()
+    server.close()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--handshake", type=float, default=0.05)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from custom_components.robovac import scheduler, tuyalocalapi
+
+    print("{} devices, {:g} s handshakes".format(args.devices, args.handshake))
+    for name, scheduled in (("scheduled", True), ("all at once", False)):
+        elapsed, peak = asyncio.run(
+            start(tuyalocalapi, scheduler, args.devices, args.handshake, scheduled)
+        )
+        print(
+            "  {}: all available after {:.2f} s, peak {} connects in progress".format(
+                name, elapsed, peak
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
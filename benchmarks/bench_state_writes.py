@@ -0,0 +1,137 @@
+"""State writes for a replayed stream of L60 status polls.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/bench_state_writes.py [--polls 10000] [--seed 0]
+
+Replays polls in which the battery level and status occasionally change, as
+a docked L60 reports them, through a RoboVacEntity. Reports how many polls
+notified the entity, how many state writes reached Home Assistant (every
+poll wrote state before updates were compared), and the time per update
+when re-reading only the changed DPS against re-reading all of them.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_KEY = "0123456789abcdef"
+STATUSES = ("AhAA", "BBADGgA=", "BhADGgIIAQ==")
+NO_ERROR = "AA=="
+
+
+def make_stream(polls, seed):
+    rng = random.Random(seed)
+    dps = {"153": STATUSES[0], "158": "Standard", "163": 100, "177": NO_ERROR}
+    stream = []
+    for _ in range(polls):
+        dps = dict(dps)
+        if rng.random() < 0.05:
+            dps["163"] = max(dps["163"] - 1, 0) if rng.random() < 0.5 else 100
+        if rng.random() < 0.01:
+            dps["153"] = rng.choice(STATUSES)
+        stream.append(dps)
+    return stream
+
+
+async def replay(stream):
+    from homeassistant.const import (
+        CONF_ACCESS_TOKEN,
+        CONF_DESCRIPTION,
+        CONF_ID,
+        CONF_IP_ADDRESS,
+        CONF_MAC,
+        CONF_MODEL,
+        CONF_NAME,
+    )
+
+    from custom_components.robovac.robovac import RoboVac
+    from custom_components.robovac.vacuum import RoboVacEntity
+
+    vacuum = RoboVac(
+        "T2266",
+        device_id="abc",
+        host="127.0.0.1",
+        local_key=LOCAL_KEY,
+        timeout=5,
+        ping_interval=10,
+        update_entity_state=None,
+    )
+    coordinator = SimpleNamespace(
+        vacuum=vacuum,
+        data=None,
+        changed_codes=None,
+        last_update_success=True,
+        state_time=None,
+        state_restored=False,
+        async_set_activity=lambda activity, sleeping: None,
+    )
+    item = {
+        CONF_NAME: "L60",
+        CONF_ID: "abc",
+        CONF_MODEL: "T2266",
+        CONF_IP_ADDRESS: "127.0.0.1",
+        CONF_ACCESS_TOKEN: LOCAL_KEY,
+        CONF_DESCRIPTION: "RoboVac L60",
+        CONF_MAC: "00:00:00:00:00:00",
+    }
+    entity = RoboVacEntity(coordinator, item)
+    writes = 0
+
+    def write():
+        nonlocal writes
+        writes += 1
+
+    entity.async_write_ha_state = write
+
+    updates = []
+    previous = {}
+    for dps in stream:
+        changed = {code for code, value in dps.items() if previous.get(code) != value}
+        # the coordinator only notifies listeners when the data differs
+        if changed:
+            coordinator.data = dps
+            coordinator.changed_codes = changed if previous else None
+            entity._handle_coordinator_update()
+            updates.append((dps, changed))
+        previous = dps
+
+    timings = []
+    for full in (False, True):
+        start = time.perf_counter()
+        for dps, changed in updates:
+            coordinator.data = dps
+            entity.update_entity_values(None if full else changed)
+        timings.append((time.perf_counter() - start) / len(updates))
+
+    await vacuum.async_disable()
+    return len(updates), writes, *timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    notified, writes, delta, full = asyncio.run(
+        replay(make_stream(args.polls, args.seed))
+    )
+    print("{} polls".format(args.polls))
+    print("  entity notified: {}".format(notified))
+    print("  state writes: {} (every poll before: {})".format(writes, args.polls))
+    print(
+        "  per update: {:.1f} us changed DPS only, {:.1f} us all DPS".format(
+            delta * 1e6, full * 1e6
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
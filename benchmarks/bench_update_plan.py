@@ -0,0 +1,116 @@
+"""Cost of compiling and applying the per-model DPS update plan.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/bench_update_plan.py [--rounds 1000]
+
+For every supported model, times compile_update_plan on its own, and
+RoboVacEntity.update_entity_values over every DPS the model reports, once
+with the cached plan and once compiling the plan again for each update as
+the per-update command lookups and feature checks used to.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_KEY = "0123456789abcdef"
+
+
+async def measure(rounds):
+    from homeassistant.const import (
+        CONF_ACCESS_TOKEN,
+        CONF_DESCRIPTION,
+        CONF_ID,
+        CONF_IP_ADDRESS,
+        CONF_MAC,
+        CONF_MODEL,
+        CONF_NAME,
+    )
+
+    from custom_components.robovac.robovac import RoboVac
+    from custom_components.robovac.vacuum import RoboVacEntity, compile_update_plan
+    from custom_components.robovac.vacuums import ROBOVAC_MODELS
+
+    entities = []
+    for model_code in ROBOVAC_MODELS:
+        vacuum = RoboVac(
+            model_code,
+            device_id=model_code,
+            host="127.0.0.1",
+            local_key=LOCAL_KEY,
+            timeout=5,
+            ping_interval=10,
+            update_entity_state=None,
+        )
+        commands = vacuum.model_details.commands
+        codes = {vacuum.dps_index.code(command) for command in commands}
+        coordinator = SimpleNamespace(
+            vacuum=vacuum,
+            data={code: "AA==" for code in codes if code is not None},
+            changed_codes=None,
+            last_update_success=True,
+            state_time=None,
+            state_restored=False,
+            async_set_activity=lambda activity, sleeping: None,
+        )
+        item = {
+            CONF_NAME: model_code,
+            CONF_ID: model_code,
+            CONF_MODEL: model_code,
+            CONF_IP_ADDRESS: "127.0.0.1",
+            CONF_ACCESS_TOKEN: LOCAL_KEY,
+            CONF_DESCRIPTION: model_code,
+            CONF_MAC: "00:00:00:00:00:00",
+        }
+        entities.append(RoboVacEntity(coordinator, item))
+
+    models = [entity.vacuum.model_details for entity in entities]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for model_details in models:
+            compile_update_plan.__wrapped__(model_details)
+    compile_time = (time.perf_counter() - start) / (rounds * len(models))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for entity in entities:
+            entity.update_entity_values(None)
+    cached = (time.perf_counter() - start) / (rounds * len(entities))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for entity in entities:
+            entity._update_plan = compile_update_plan.__wrapped__(
+                entity.vacuum.model_details
+            )
+            entity.update_entity_values(None)
+    recompiled = (time.perf_counter() - start) / (rounds * len(entities))
+
+    for entity in entities:
+        await entity.vacuum.async_disable()
+    return len(entities), compile_time, cached, recompiled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    models, compile_time, cached, recompiled = asyncio.run(measure(args.rounds))
+    print("{} models, {} rounds".format(models, args.rounds))
+    print("  compile_update_plan: {:.1f} us per model".format(compile_time * 1e6))
+    print(
+        "  full update: {:.1f} us with the cached plan, {:.1f} us compiling it".format(
+            cached * 1e6, recompiled * 1e6
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
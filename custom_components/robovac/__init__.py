@@ -15,21 +15,32 @@
 
 """The Eufy Robovac L60 integration."""
 from __future__ import annotations
+import asyncio
 import logging
+from typing import TYPE_CHECKING
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform, CONF_IP_ADDRESS
-from homeassistant.core import HomeAssistant
-from .const import CONF_VACS, DOMAIN
+from .const import CONF_VACS, COORDINATORS, DOMAIN, SCHEDULER
+from .scheduler import FleetScheduler
 
 from .tuyalocaldiscovery import TuyaLocalDiscovery
 
-PLATFORMS = [Platform.VACUUM, Platform.SENSOR]
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+# Home Assistant and the coordinator are imported by the functions that use
+# them, so importing the protocol modules (robovac, tuyalocalapi) does not
+# pull in Home Assistant.
+PLATFORMS = ["vacuum", "sensor"]
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass, entry) -> bool:
-    hass.data.setdefault(DOMAIN, {CONF_VACS:{}})
+    from homeassistant.const import CONF_IP_ADDRESS, EVENT_HOMEASSISTANT_STOP
+
+    hass.data.setdefault(
+        DOMAIN, {CONF_VACS:{}, COORDINATORS:{}, SCHEDULER: FleetScheduler()}
+    )
 
     async def update_device(device):
         entry = async_get_config_entry_for_device(hass, device["gwId"])
@@ -68,8 +79,22 @@ async def async_setup(hass, entry) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Eufy Robovac L60 from a config entry."""
+    from homeassistant.const import CONF_ID
+
+    from .coordinator import RoboVacCoordinator
+
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
+    coordinators = hass.data[DOMAIN][COORDINATORS]
+    scheduler = hass.data[DOMAIN][SCHEDULER]
+    restores = []
+    for item in entry.data[CONF_VACS].values():
+        coordinator = RoboVacCoordinator(hass, entry, item, scheduler)
+        coordinators[item[CONF_ID]] = coordinator
+        restores.append(coordinator.async_restore())
+    # show the last known state straight away, before any vacuum is contacted
+    await asyncio.gather(*restores)
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
@@ -80,10 +105,26 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(
         entry, PLATFORMS
     ):
-        """Nothing"""
+        coordinators = hass.data[DOMAIN][COORDINATORS]
+        for device_id in entry.data[CONF_VACS]:
+            coordinator = coordinators.pop(device_id, None)
+            if coordinator is not None:
+                await coordinator.async_shutdown()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the saved state of the entry's vacuums."""
+    from .coordinator import snapshot_store
+
+    await asyncio.gather(
+        *(
+            snapshot_store(hass, device_id).async_remove()
+            for device_id in entry.data[CONF_VACS]
+        )
+    )
+
+
 async def update_listener(hass, entry):
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
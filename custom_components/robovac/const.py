@@ -3,6 +3,24 @@
 DOMAIN = "robovac"
 CONF_VACS = "vacuums"
 CONF_AUTODISCOVERY = "autodiscovery"
+COORDINATORS = "coordinators"
+SCHEDULER = "scheduler"
 REFRESH_RATE = 60
+# polling interval while cleaning or returning to the dock
+REFRESH_RATE_ACTIVE = 15
+# polling interval while an L60 is asleep; it pushes when it wakes up
+REFRESH_RATE_SLEEPING = 900
+STALE_AFTER = 30
 PING_RATE = 10
+# heartbeat interval while an L60 is asleep, so pings do not keep it awake
+PING_RATE_SLEEPING = 300
 TIMEOUT = 5
+UPDATE_RETRIES = 3
+# DPS snapshots are written at most this often
+SNAPSHOT_SAVE_DELAY = 30
+SNAPSHOT_VERSION = 1
+# vacuums opening a connection at the same time
+MAX_CONCURRENT_CONNECTS = 8
+# startup contact is spread over STARTUP_STEP seconds per vacuum, at most STARTUP_SPREAD
+STARTUP_STEP = 0.05
+STARTUP_SPREAD = 10
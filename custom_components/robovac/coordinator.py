@@ -0,0 +1,290 @@
+# Copyright 2022 Brendan McCluskey
+# Copyright (c) 2025 Dave Harvey
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-device update coordinator for the Eufy Robovac L60 integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.components.vacuum import VacuumActivity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_ID,
+    CONF_IP_ADDRESS,
+    CONF_MODEL,
+    CONF_NAME,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    PING_RATE,
+    PING_RATE_SLEEPING,
+    REFRESH_RATE,
+    REFRESH_RATE_ACTIVE,
+    REFRESH_RATE_SLEEPING,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_VERSION,
+    STALE_AFTER,
+    TIMEOUT,
+    UPDATE_RETRIES,
+)
+from .robovac import ModelNotSupportedException, RoboVac
+from .scheduler import FleetScheduler
+from .tuyalocalapi import TuyaException
+
+_LOGGER = logging.getLogger(__name__)
+
+WARM_UP_ATTEMPTS = 5
+WARM_UP_DELAY = 1.5
+
+ACTIVE_ACTIVITIES = (VacuumActivity.CLEANING, VacuumActivity.RETURNING)
+
+
+def snapshot_store(hass: HomeAssistant, device_id: str) -> Store:
+    """The store holding a vacuum's last known DPS."""
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{device_id}")
+
+
+class RoboVacCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Owns the connection to one vacuum and shares its DPS with entities.
+
+    Pushed updates from the vacuum are handed to every entity straight away
+    and reset the refresh timer, so GET polling only happens when the vacuum
+    has been quiet for a whole refresh interval. Entities are only notified
+    when a DPS value changed; ``changed_codes`` holds the codes that did, or
+    None when everything should be re-read.
+
+    The refresh interval follows what the vacuum is doing: short while it
+    cleans or heads home, long while docked or idle, and very long while an
+    L60 sleeps.
+
+    The last known DPS are saved per device and restored on startup, so
+    entities show the previous state before the vacuum has been contacted.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        item: dict,
+        scheduler: FleetScheduler,
+    ) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=item[CONF_NAME],
+            update_interval=timedelta(seconds=REFRESH_RATE),
+            always_update=False,
+        )
+        self.item = item
+        self.scheduler = scheduler
+        self.update_failures = 0
+        self.changed_codes: set[str] | None = None
+        self._force_refresh = False
+        self._warm_up_task: asyncio.Task | None = None
+        # when the vacuum last reported a change, and whether that was
+        # before the last restart
+        self.state_time: datetime | None = None
+        self.state_restored = False
+        self._store = snapshot_store(hass, item[CONF_ID])
+        self._snapshot_pending = False
+
+        try:
+            self.vacuum: RoboVac | None = RoboVac(
+                device_id=item[CONF_ID],
+                host=item[CONF_IP_ADDRESS],
+                local_key=item[CONF_ACCESS_TOKEN],
+                timeout=TIMEOUT,
+                ping_interval=PING_RATE,
+                model_code=item[CONF_MODEL][0:5],
+                update_entity_state=self.async_pushed_update,
+                connect_slots=scheduler.connect_slots,
+                phase=scheduler.phase(item[CONF_ID]),
+            )
+        except ModelNotSupportedException:
+            self.vacuum = None
+        else:
+            scheduler.register(item[CONF_ID])
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch the state, unless a recent push already provided it."""
+        if self.vacuum is None or not self.item[CONF_IP_ADDRESS]:
+            return {}
+
+        max_age = (
+            None
+            if self._force_refresh
+            else min(STALE_AFTER, self.update_interval.total_seconds())
+        )
+        self._force_refresh = False
+        try:
+            self.changed_codes = set(await self.vacuum.async_get(max_age=max_age))
+            self.async_state_received(self.changed_codes)
+        except TuyaException as e:
+            self.changed_codes = set()
+            self.update_failures += 1
+            _LOGGER.warning(
+                "Update errored. Current update failure count: %s. Reason: %s",
+                self.update_failures,
+                e,
+            )
+            if self.update_failures >= UPDATE_RETRIES:
+                raise UpdateFailed(str(e)) from e
+        else:
+            self.update_failures = 0
+
+        return self.vacuum.state
+
+    async def async_pushed_update(self, changed: dict[str, Any]) -> None:
+        """Share a state update pushed by the vacuum with all entities."""
+        self.update_failures = 0
+        self.changed_codes = set(changed)
+        self.async_state_received(self.changed_codes)
+        self.async_set_updated_data(self.vacuum.state)
+
+    @callback
+    def async_set_activity(self, activity: VacuumActivity, sleeping: bool) -> None:
+        """Adapt polling, pings and the response timeout to what the vacuum does.
+
+        A new refresh interval applies from the next scheduled refresh; any
+        push from the vacuum reschedules it straight away.
+        """
+        self.vacuum.asleep = sleeping
+        self.vacuum.set_ping_interval(PING_RATE_SLEEPING if sleeping else PING_RATE)
+        if sleeping:
+            seconds = REFRESH_RATE_SLEEPING
+        elif activity in ACTIVE_ACTIVITIES:
+            seconds = REFRESH_RATE_ACTIVE
+        else:
+            seconds = REFRESH_RATE
+
+        interval = timedelta(seconds=seconds)
+        if interval == self.update_interval:
+            return
+        _LOGGER.debug("Refreshing %s every %s s", self.name, seconds)
+        self.update_interval = interval
+
+    async def async_force_refresh(self) -> None:
+        """Request a refresh that always goes to the vacuum."""
+        self._force_refresh = True
+        await self.async_request_refresh()
+
+    @callback
+    def async_start_warm_up(self) -> None:
+        """Warm up in the background, so entity setup does not wait on it.
+
+        The task belongs to the config entry, which cancels it on unload.
+        """
+        if self._warm_up_task is None:
+            self._warm_up_task = self.config_entry.async_create_background_task(
+                self.hass, self.async_warm_up(), f"{DOMAIN} warm up {self.name}"
+            )
+
+    async def async_warm_up(self) -> bool:
+        """Try a few reads so the vacuum comes up cleanly on restart.
+
+        The first read waits for this vacuum's slot in the fleet's startup
+        window, or in the polling interval when a restored state is already
+        shown. That also sets the phase of its later polls; retries are
+        jittered.
+        """
+        device_id = self.item[CONF_ID]
+        if self.state_restored:
+            delay = self.scheduler.poll_delay(
+                device_id, self.update_interval.total_seconds()
+            )
+        else:
+            delay = self.scheduler.startup_delay(device_id)
+        await asyncio.sleep(delay)
+        for attempt in range(WARM_UP_ATTEMPTS):
+            try:
+                changed = await self.vacuum.async_get()
+            except Exception as err:
+                _LOGGER.debug("Startup refresh attempt %s failed: %s", attempt + 1, err)
+                await asyncio.sleep(WARM_UP_DELAY * random.uniform(0.5, 1.5))
+            else:
+                self.update_failures = 0
+                self.changed_codes = None
+                self.async_state_received(changed)
+                self.async_set_updated_data(self.vacuum.state)
+                return True
+
+        self.async_set_update_error(
+            UpdateFailed("No response from {}".format(self.name))
+        )
+        return False
+
+    async def async_restore(self) -> None:
+        """Load the DPS saved by the last run, before any network traffic."""
+        if self.vacuum is None:
+            return
+        snapshot = await self._store.async_load()
+        if not snapshot or not snapshot.get("dps"):
+            return
+
+        self.vacuum.restore_state(snapshot["dps"])
+        self.state_time = dt_util.parse_datetime(snapshot.get("time") or "")
+        self.state_restored = True
+        self.changed_codes = None
+        self.data = self.vacuum.state
+
+    @callback
+    def async_state_received(self, changed) -> None:
+        """Note a reply from the vacuum and save the DPS if they changed.
+
+        Writes are debounced by the store, so a busy vacuum costs one write
+        per SNAPSHOT_SAVE_DELAY.
+        """
+        self.state_restored = False
+        if not changed:
+            return
+        self.state_time = dt_util.utcnow()
+        self._snapshot_pending = True
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot(self) -> dict[str, Any]:
+        self._snapshot_pending = False
+        return {
+            # non-string keys are local placeholders, not DPS from the vacuum
+            "dps": {
+                code: value
+                for code, value in self.vacuum.state.items()
+                if isinstance(code, str)
+            },
+            "time": self.state_time.isoformat() if self.state_time else None,
+        }
+
+    async def async_shutdown(self) -> None:
+        """Stop polling, close the connection and write any pending snapshot."""
+        await super().async_shutdown()
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+        if self.vacuum is not None:
+            self.scheduler.unregister(self.item[CONF_ID])
+            await self.vacuum.async_disable()
+        if self._snapshot_pending:
+            # flush now, so a delayed write cannot land after the entry is removed
+            await self._store.async_save(self._snapshot())
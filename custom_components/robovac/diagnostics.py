@@ -0,0 +1,51 @@
+# Copyright 2022 Brendan McCluskey
+# Copyright (c) 2025 Dave Harvey
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Diagnostics for the Eufy Robovac L60 integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MODEL
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_VACS, COORDINATORS, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Connection health of each vacuum, and the DPS its model does not know.
+
+    Local keys and addresses are left out.
+    """
+    coordinators = hass.data[DOMAIN][COORDINATORS]
+    vacuums = {}
+    for device_id, item in entry.data[CONF_VACS].items():
+        coordinator = coordinators.get(device_id)
+        if coordinator is None:
+            continue
+        vacuum = coordinator.vacuum
+        vacuums[device_id] = {
+            "model": item[CONF_MODEL],
+            "breaker": vacuum.breaker.state,
+            "failures": vacuum.breaker.failures,
+            "response_timeout": vacuum.rtt.timeout,
+            "merged_writes": vacuum.merged_writes,
+            # code -> number of updates that carried it
+            "unknown_dps": dict(vacuum.unknown_dps),
+        }
+    return {"vacuums": vacuums}
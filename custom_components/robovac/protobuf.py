@@ -0,0 +1,97 @@
+"""Minimal protobuf wire-format decoding for base64 encoded L60 DPS values."""
+
+import base64
+import binascii
+import functools
+
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LENGTH_DELIMITED = 2
+WIRE_FIXED32 = 5
+
+
+class ProtobufDecodeError(ValueError):
+    """The data is not a valid protobuf message."""
+
+
+def decode_varint(data, offset=0):
+    """Decode a varint at offset, returning the value and the next offset."""
+    result = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ProtobufDecodeError("Truncated varint")
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
+        if shift >= 64:
+            raise ProtobufDecodeError("Varint too long")
+
+
+def decode_message(data):
+    """Decode a message into a dict of field number -> tuple of values.
+
+    Varint and fixed fields decode to ints, length-delimited fields stay as
+    bytes; pass them to decode_message again for nested messages or to
+    decode_packed_varints for packed repeated fields.
+    """
+    fields = {}
+    offset = 0
+    while offset < len(data):
+        key, offset = decode_varint(data, offset)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == WIRE_VARINT:
+            value, offset = decode_varint(data, offset)
+        elif wire_type == WIRE_LENGTH_DELIMITED:
+            size, offset = decode_varint(data, offset)
+            if offset + size > len(data):
+                raise ProtobufDecodeError("Truncated length-delimited field")
+            value = bytes(data[offset : offset + size])
+            offset += size
+        elif wire_type in (WIRE_FIXED32, WIRE_FIXED64):
+            size = 4 if wire_type == WIRE_FIXED32 else 8
+            if offset + size > len(data):
+                raise ProtobufDecodeError("Truncated fixed field")
+            value = int.from_bytes(data[offset : offset + size], "little")
+            offset += size
+        else:
+            raise ProtobufDecodeError("Unsupported wire type {}".format(wire_type))
+        fields[field] = fields.get(field, ()) + (value,)
+
+    return fields
+
+
+def decode_packed_varints(data):
+    """Decode a packed repeated varint field."""
+    values = []
+    offset = 0
+    while offset < len(data):
+        value, offset = decode_varint(data, offset)
+        values.append(value)
+    return tuple(values)
+
+
+@functools.lru_cache(maxsize=256)
+def decode_dps(value):
+    """Decode a base64, length-prefixed protobuf DPS value.
+
+    Results are cached by the raw string, so the returned dict must not be
+    modified.
+    """
+    try:
+        data = base64.b64decode(value, validate=True)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ProtobufDecodeError("Value is not base64") from e
+    size, offset = decode_varint(data)
+    if size != len(data) - offset:
+        raise ProtobufDecodeError("Length prefix does not match the message")
+    return decode_message(data[offset:])
+
+
+def get_field(fields, field, default=None):
+    """Return the last value of a field, as protobuf does for singular fields."""
+    values = fields.get(field)
+    return values[-1] if values else default
@@ -1,12 +1,101 @@
+from collections import Counter
+from collections.abc import Mapping
+import functools
+import logging
+from typing import Any, Callable, NamedTuple
+
 from .vacuums.base import RobovacCommand
 from .tuyalocalapi import TuyaDevice
 from .vacuums import ROBOVAC_MODELS
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class ModelNotSupportedException(Exception):
     """This model is not supported"""
 
 
+def friendly_text(input: str) -> str:
+    return " ".join(word[0].upper() + word[1:] for word in input.replace("_", " ").split())
+
+
+def decode_raw(value: Any) -> Any:
+    return value
+
+
+class DpsEntry(NamedTuple):
+    """One command of a model and the DPS code that carries it."""
+
+    command: RobovacCommand
+    code: str
+    values: tuple | None
+    encode: Callable[[Any], Any]
+
+
+class DpsIndex:
+    """Two-way index between a model's DPS codes and its commands."""
+
+    def __init__(self, commands: Mapping[RobovacCommand, Any]):
+        self.by_command: dict[RobovacCommand, DpsEntry] = {}
+        self.by_code: dict[str, DpsEntry] = {}
+        for command, spec in commands.items():
+            if isinstance(spec, Mapping):
+                code, values = spec["code"], tuple(spec["values"])
+                # accept the friendly names shown in Home Assistant, or raw values
+                names = {friendly_text(value): value for value in values}
+                encode = self._value_encoder(names)
+            else:
+                code, values, encode = spec, None, decode_raw
+            entry = DpsEntry(command, str(code), values, encode)
+            self.by_command[command] = entry
+            self.by_code[entry.code] = entry
+
+    @staticmethod
+    def _value_encoder(names: dict[str, str]) -> Callable[[Any], Any]:
+        def encode(value: Any) -> Any:
+            return names.get(value, value)
+
+        return encode
+
+    def code(self, command: RobovacCommand) -> str | None:
+        """The DPS code carrying a command, if the model has it."""
+        entry = self.by_command.get(command)
+        return None if entry is None else entry.code
+
+    def encode(self, command: RobovacCommand, value: Any) -> dict[str, Any]:
+        """The DPS to send to set a command to value."""
+        entry = self.by_command[command]
+        return {entry.code: entry.encode(value)}
+
+    def route(
+        self, dps: Mapping[str, Any], unknown: Counter | None = None
+    ) -> dict[RobovacCommand, Any]:
+        """Key received DPS by command, counting codes the model lacks.
+
+        Values are left raw; the vacuum entity's update plan decodes them.
+        Keys that are not strings are placeholders set locally, such as the
+        connection error, not DPS the vacuum sent.
+        """
+        routed = {}
+        by_code = self.by_code
+        for code, value in dps.items():
+            if not isinstance(code, str):
+                continue
+            entry = by_code.get(code)
+            if entry is None:
+                if unknown is not None:
+                    unknown[code] += 1
+                continue
+            routed[entry.command] = value
+        return routed
+
+
+@functools.cache
+def build_dps_index(model_details) -> DpsIndex:
+    """Build a model's DPS index once; models share it."""
+    return DpsIndex(model_details.commands)
+
+
 class RoboVac(TuyaDevice):
     """"""
 
@@ -17,8 +106,23 @@ class RoboVac(TuyaDevice):
             )
 
         self.model_details = ROBOVAC_MODELS[model_code]
+        self.dps_index = build_dps_index(self.model_details)
+        # DPS codes received that the model spec does not know, for diagnostics
+        self.unknown_dps: Counter = Counter()
         super().__init__(self.model_details, *args, **kwargs)
 
+    def route_dps(self, dps: Mapping[str, Any]) -> dict[RobovacCommand, Any]:
+        """Map received DPS to commands, counting the unknown codes."""
+        known = len(self.unknown_dps)
+        routed = self.dps_index.route(dps, self.unknown_dps)
+        if len(self.unknown_dps) != known:
+            _LOGGER.debug(
+                "%s sent DPS codes its model does not describe: %s",
+                self.device_id,
+                dict(self.unknown_dps),
+            )
+        return routed
+
     def getHomeAssistantFeatures(self):
         return self.model_details.homeassistant_features
 
@@ -26,20 +130,15 @@ class RoboVac(TuyaDevice):
         return self.model_details.robovac_features
 
     def getFanSpeeds(self):
-        return self.model_details.commands[RobovacCommand.FAN_SPEED]["values"]
+        return self.dps_index.by_command[RobovacCommand.FAN_SPEED].values
 
     def getModes(self):
-        return self.model_details.commands[RobovacCommand.MODE]["values"]
+        return self.dps_index.by_command[RobovacCommand.MODE].values
 
     def getSupportedCommands(self):
-        return list(self.model_details.commands.keys())
+        return list(self.dps_index.by_command)
 
     def getCommandCodes(self):
-        command_codes = {}
-        for key, value in self.model_details.commands.items():
-            if isinstance(value, dict):
-                command_codes[key] = str(value["code"])
-            else:
-                command_codes[key] = str(value)
-
-        return command_codes
+        return {
+            command: entry.code for command, entry in self.dps_index.by_command.items()
+        }
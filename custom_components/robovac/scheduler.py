@@ -0,0 +1,61 @@
+# Copyright 2022 Brendan McCluskey
+# Copyright (c) 2025 Dave Harvey
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Spreads the network work of many vacuums over time."""
+
+from __future__ import annotations
+
+import asyncio
+import zlib
+
+from .const import MAX_CONCURRENT_CONNECTS, STARTUP_SPREAD, STARTUP_STEP
+
+
+class FleetScheduler:
+    """Staggers connects, pings and polls across all configured vacuums.
+
+    Every device gets a fixed phase in [0, 1) derived from its id, so the
+    same vacuum always starts at the same point of an interval and a fleet
+    spreads out evenly instead of acting in lockstep. Connects share a
+    semaphore so only a few sockets are being opened at once.
+    """
+
+    def __init__(self, max_connects: int = MAX_CONCURRENT_CONNECTS) -> None:
+        self.connect_slots = asyncio.Semaphore(max_connects)
+        self.devices: set[str] = set()
+
+    def register(self, device_id: str) -> None:
+        self.devices.add(device_id)
+
+    def unregister(self, device_id: str) -> None:
+        self.devices.discard(device_id)
+
+    @staticmethod
+    def phase(device_id: str) -> float:
+        """Deterministic position of a device within any interval."""
+        return zlib.crc32(device_id.encode()) / 2**32
+
+    def startup_delay(self, device_id: str) -> float:
+        """How long a device waits before its first contact after startup.
+
+        The window grows with the fleet, so a single vacuum starts at once
+        while a hundred spread over five seconds.
+        """
+        window = min(len(self.devices) * STARTUP_STEP, STARTUP_SPREAD)
+        return self.phase(device_id) * window
+
+    def poll_delay(self, device_id: str, interval: float) -> float:
+        """This device's offset within a polling interval."""
+        return self.phase(device_id) * interval
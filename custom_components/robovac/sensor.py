@@ -14,39 +14,49 @@
 # limitations under the License.
 
 import logging
-from datetime import timedelta
+from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, EntityCategory, CONF_NAME, CONF_ID
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    CONF_NAME,
+    CONF_ID,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_VACS, DOMAIN, REFRESH_RATE
+from .const import CONF_VACS, COORDINATORS, DOMAIN
+from .coordinator import RoboVacCoordinator
+from .vacuums.base import RobovacCommand
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=REFRESH_RATE)
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up battery sensors for each vacuum."""
+    """Set up battery and round-trip time sensors for each vacuum."""
     vacuums = config_entry.data[CONF_VACS]
 
-    entities: list[RobovacBatterySensor] = []
+    entities: list[SensorEntity] = []
     for key in vacuums:
         item = vacuums[key]
-        entities.append(RobovacBatterySensor(item))
+        coordinator = hass.data[DOMAIN][COORDINATORS][item[CONF_ID]]
+        entities.append(RobovacBatterySensor(coordinator, item))
+        if coordinator.vacuum is not None:
+            entities.append(RobovacRoundTripSensor(coordinator, item))
 
     async_add_entities(entities)
 
 
-class RobovacBatterySensor(SensorEntity):
+class RobovacBatterySensor(CoordinatorEntity[RoboVacCoordinator], SensorEntity):
     """Battery % for a Robovac, linked to the same device as the vacuum entity."""
 
     _attr_has_entity_name = True
@@ -55,7 +65,8 @@ class RobovacBatterySensor(SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_native_unit_of_measurement = PERCENTAGE
 
-    def __init__(self, item: dict) -> None:
+    def __init__(self, coordinator: RoboVacCoordinator, item: dict) -> None:
+        super().__init__(coordinator)
         self.robovac_id = item[CONF_ID]
 
         # IMPORTANT: do NOT reuse the vacuum unique_id
@@ -66,20 +77,50 @@ class RobovacBatterySensor(SensorEntity):
             name=item[CONF_NAME],
         )
 
-        self._battery_level: int | None = None
+        self._battery_code: str | None = None
+        if coordinator.vacuum is not None:
+            self._battery_code = coordinator.vacuum.dps_index.code(
+                RobovacCommand.BATTERY
+            )
 
-    def update(self) -> None:
-        """Poll battery from the vacuum entity cache."""
+    @property
+    def native_value(self) -> int | None:
+        """Battery level from the state shared by the coordinator."""
+        if self._battery_code is None or not self.coordinator.data:
+            return None
         try:
-            vac_entity = self.hass.data[DOMAIN][CONF_VACS][self.robovac_id]
-            # Read an internal cache set by vacuum.py
-            self._battery_level = getattr(vac_entity, "_battery_level_cache", None)
-            self._attr_available = self._battery_level is not None
-        except Exception:
+            return int(self.coordinator.data[self._battery_code])
+        except (KeyError, TypeError, ValueError):
             _LOGGER.debug("Failed to get battery level for %s", self.robovac_id)
-            self._battery_level = None
-            self._attr_available = False
+            return None
+
+    @property
+    def available(self) -> bool:
+        return super().available and self.native_value is not None
+
+
+class RobovacRoundTripSensor(CoordinatorEntity[RoboVacCoordinator], SensorEntity):
+    """Smoothed round-trip time to a Robovac, with the derived response timeout."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Round trip time"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(self, coordinator: RoboVacCoordinator, item: dict) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{item[CONF_ID]}_round_trip_time"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, item[CONF_ID])},
+            name=item[CONF_NAME],
+        )
+        self._rtt = coordinator.vacuum.rtt
 
     @property
     def native_value(self) -> int | None:
-        return self._battery_level
+        return self._rtt.as_dict()["srtt_ms"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self._rtt.as_dict()
@@ -40,31 +40,49 @@
 
 import asyncio
 import base64
+import contextlib
+import heapq
+import itertools
 import json
 import logging
+import random
 import socket
 import struct
 import sys
 import time
 import traceback
+import zlib
 from typing import Callable, Coroutine
 
 from cryptography.hazmat.backends.openssl import backend as openssl_backend
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.hashes import Hash, MD5
-from cryptography.hazmat.primitives.padding import PKCS7
 
 from .vacuums.base import RobovacCommand
 
 INITIAL_BACKOFF = 5
 INITIAL_QUEUE_TIME = 0.1
+RECONNECT_DELAY = 1
+SET_COALESCE_TIME = 0.05
 BACKOFF_MULTIPLIER = 1.70224
 _LOGGER = logging.getLogger(__name__)
 MESSAGE_PREFIX_FORMAT = ">IIII"
 MESSAGE_SUFFIX_FORMAT = ">II"
 MAGIC_PREFIX = 0x000055AA
 MAGIC_SUFFIX = 0x0000AA55
+MAGIC_PREFIX_BYTES = struct.pack(">I", MAGIC_PREFIX)
 MAGIC_SUFFIX_BYTES = struct.pack(">I", MAGIC_SUFFIX)
+MAX_PAYLOAD_SIZE = 0xFFFF
+READ_SIZE = 4096
+MIN_RESPONSE_TIMEOUT = 1
+MAX_RESPONSE_TIMEOUT = 15
+# a vacuum waking from sleep can take seconds to answer; added to the
+# response timeout only while the vacuum is known to be asleep
+WAKE_ALLOWANCE = 4
+FAILURE_THRESHOLD = 3
+# requests waiting for a response; the oldest is dropped beyond this
+MAX_LISTENERS = 64
+MAX_BACKOFF = 600
 CRC_32_TABLE = [
     0x00000000,
     0x77073096,
@@ -364,58 +382,66 @@ class BackoffException(TuyaException):
 class TuyaCipher:
     """Tuya cryptographic helpers."""
 
+    block_size = 16
+    padding = [bytes([size]) * size for size in range(block_size + 1)]
+
     def __init__(self, key, version):
         """Initialize the cipher."""
         self.version = version
         self.key = key
+        self.version_string = ".".join(map(str, version))
+        self.version_prefix = self.version_string.encode("utf8")
         self.cipher = Cipher(
             algorithms.AES(key.encode("ascii")), modes.ECB(), backend=openssl_backend
         )
+        # ECB has no chaining state, so whole blocks can be pushed through one
+        # long-lived context without ever finalizing it.
+        self._encryptor = self.cipher.encryptor()
+        self._decryptor = self.cipher.decryptor()
 
     def get_prefix_size_and_validate(self, command, encrypted_data):
-        try:
-            version = tuple(map(int, encrypted_data[:3].decode("utf8").split(".")))
-        except ValueError:
-            version = (0, 0)
-        if version != self.version:
+        if encrypted_data[:3] != self.version_prefix:
             return 0
-        if version < (3, 3):
+        if self.version < (3, 3):
             hash = encrypted_data[3:19].decode("ascii")
             expected_hash = self.hash(encrypted_data[19:])
             if hash != expected_hash:
                 return 0
             return 19
         else:
+            # version, then 12 bytes of sequence and padding
             if command in (Message.SET_COMMAND, Message.GRATUITOUS_UPDATE):
-                _, sequence, __, ___ = struct.unpack_from(">IIIH", encrypted_data, 3)
+                if len(encrypted_data) < 15:
+                    return 0
                 return 15
         return 0
 
+    def pad(self, data):
+        return data + self.padding[self.block_size - len(data) % self.block_size]
+
+    def unpad(self, data):
+        size = data[-1] if data else 0
+        if not 0 < size <= self.block_size or data[-size:] != self.padding[size]:
+            raise ValueError("Invalid padding bytes.")
+        return data[:-size]
+
     def decrypt(self, command, data):
         prefix_size = self.get_prefix_size_and_validate(command, data)
         data = data[prefix_size:]
-        decryptor = self.cipher.decryptor()
         if self.version < (3, 3):
             data = base64.b64decode(data)
-        decrypted_data = decryptor.update(data)
-        decrypted_data += decryptor.finalize()
-        unpadder = PKCS7(128).unpadder()
-        unpadded_data = unpadder.update(decrypted_data)
-        unpadded_data += unpadder.finalize()
+        if len(data) % self.block_size:
+            raise ValueError("Data length is not a multiple of the block size.")
+        decrypted_data = self._decryptor.update(data)
 
-        return unpadded_data
+        return self.unpad(decrypted_data)
 
     def encrypt(self, command, data):
         encrypted_data = b""
         if data:
-            padder = PKCS7(128).padder()
-            padded_data = padder.update(data)
-            padded_data += padder.finalize()
-            encryptor = self.cipher.encryptor()
-            encrypted_data = encryptor.update(padded_data)
-            encrypted_data += encryptor.finalize()
-
-        prefix = ".".join(map(str, self.version)).encode("utf8")
+            encrypted_data = self._encryptor.update(self.pad(data))
+
+        prefix = self.version_prefix
         if self.version < (3, 3):
             payload = base64.b64encode(encrypted_data)
             hash = self.hash(payload)
@@ -432,14 +458,14 @@ class TuyaCipher:
     def hash(self, data):
         digest = Hash(MD5(), backend=openssl_backend)
         to_hash = "data={}||lpv={}||{}".format(
-            data.decode("ascii"), ".".join(map(str, self.version)), self.key
+            data.decode("ascii"), self.version_string, self.key
         )
         digest.update(to_hash.encode("utf8"))
         intermediate = digest.finalize().hex()
         return intermediate[8:24]
 
 
-def crc(data):
+def table_crc(data):
     """Calculate the Tuya-flavored CRC of some data."""
     c = 0xFFFFFFFF
     for b in data:
@@ -448,11 +474,121 @@ def crc(data):
     return c ^ 0xFFFFFFFF
 
 
+def select_crc():
+    """Use zlib's CRC-32 when it agrees with the Tuya table, else the table."""
+    sample = bytes(range(256)) + b"123456789"
+    for size in (0, 1, 9, len(sample)):
+        if zlib.crc32(sample[:size]) != table_crc(sample[:size]):
+            return table_crc
+    return zlib.crc32
+
+
+crc = select_crc()
+
+
+class MessageBuffer:
+    """Accumulates stream data and cuts it into complete Tuya frames.
+
+    A prefix followed by a plausible header is taken as the start of a frame
+    until the data proves otherwise: its suffix is wrong, or a valid frame
+    turns up further on while it is still incomplete.
+    """
+
+    header_size = struct.calcsize(MESSAGE_PREFIX_FORMAT)
+    suffix_size = struct.calcsize(MESSAGE_SUFFIX_FORMAT)
+    # Tuya commands fit in a byte; anything larger is not a header
+    max_command = 0xFF
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.discarded = 0
+
+    def _frame_end(self, buffer, offset):
+        """Where the frame whose prefix is at offset ends, or None if no header."""
+        _, _, command, payload_size = struct.unpack_from(
+            MESSAGE_PREFIX_FORMAT, buffer, offset
+        )
+        if (
+            command > self.max_command
+            or payload_size < self.suffix_size
+            or payload_size > MAX_PAYLOAD_SIZE
+        ):
+            return None
+        return offset + self.header_size + payload_size
+
+    def _is_valid_frame(self, buffer, offset):
+        """Whether a complete frame with a correct suffix and CRC starts at offset."""
+        if len(buffer) - offset < self.header_size:
+            return False
+        end = self._frame_end(buffer, offset)
+        if end is None or len(buffer) < end:
+            return False
+        checksum, suffix = struct.unpack_from(
+            MESSAGE_SUFFIX_FORMAT, buffer, end - self.suffix_size
+        )
+        return suffix == MAGIC_SUFFIX and checksum == crc(
+            buffer[offset : end - self.suffix_size]
+        )
+
+    def _next_valid_frame(self, buffer, offset):
+        """The start of the next valid complete frame after offset, or -1."""
+        start = buffer.find(MAGIC_PREFIX_BYTES, offset + 1)
+        while start != -1 and not self._is_valid_frame(buffer, start):
+            start = buffer.find(MAGIC_PREFIX_BYTES, start + 1)
+        return start
+
+    def feed(self, data):
+        """Add data to the buffer and return every complete frame it holds."""
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        offset = 0
+
+        while True:
+            start = buffer.find(MAGIC_PREFIX_BYTES, offset)
+            if start == -1:
+                # keep a partial prefix that may be completed by the next read
+                keep = min(len(buffer) - offset, len(MAGIC_PREFIX_BYTES) - 1)
+                self.discarded += len(buffer) - offset - keep
+                offset = len(buffer) - keep
+                break
+            self.discarded += start - offset
+            offset = start
+
+            if len(buffer) - offset < self.header_size:
+                break
+            end = self._frame_end(buffer, offset)
+            if end is None:
+                # not a real header, resynchronise on the next prefix
+                offset += 1
+                continue
+
+            if len(buffer) < end:
+                # a bogus header must not hold back the frames behind it
+                start = self._next_valid_frame(buffer, offset)
+                if start == -1:
+                    break
+                self.discarded += start - offset
+                offset = start
+                continue
+            if buffer[end - len(MAGIC_SUFFIX_BYTES) : end] != MAGIC_SUFFIX_BYTES:
+                offset += 1
+                continue
+
+            frames.append(bytes(buffer[offset:end]))
+            offset = end
+
+        del buffer[:offset]
+        return frames
+
+
 class Message:
     PING_COMMAND = 0x09
     GET_COMMAND = 0x0A
     SET_COMMAND = 0x07
     GRATUITOUS_UPDATE = 0x08
+    # lower values are sent first: user commands, then state polls, then pings
+    QUEUE_PRIORITY = {SET_COMMAND: 0, GET_COMMAND: 1, PING_COMMAND: 2}
 
     def __init__(
         self,
@@ -469,19 +605,22 @@ class Message:
         self.payload = payload
         self.command = command
         self.original_sequence = sequence
+        self.encrypt = encrypt
+        self.device = device
         if sequence is None:
             self.set_sequence()
         else:
             self.sequence = sequence
-        self.encrypt = encrypt
-        self.device = device
         self.expiry = int(time.time()) + ttl
         self.expect_response = expect_response
         self.listener = None
+        self.sent_at = None
+        self.listener_expiry = None
+        # the caller's response deadline, moved to the RTT timeout once sent
+        self.deadline = None
+        # registered with the device only once the frame is written
         if expect_response is True:
-            self.listener = asyncio.Semaphore(0)
-            if device is not None:
-                device._listeners[self.sequence] = self.listener
+            self.listener = asyncio.get_running_loop().create_future()
 
     def __repr__(self):
         return "{}({}, {!r}, {!r}, {})".format(
@@ -493,7 +632,10 @@ class Message:
         )
 
     def set_sequence(self):
-        self.sequence = int(time.perf_counter() * 1000) & 0xFFFFFFFF
+        if self.device is not None:
+            self.sequence = self.device.next_sequence()
+        else:
+            self.sequence = int(time.perf_counter() * 1000) & 0xFFFFFFFF
 
     def hex(self):
         return self.bytes().hex()
@@ -529,6 +671,17 @@ class Message:
     async def async_send(self):
         await self.device._async_send(self)
 
+    def is_live(self, now):
+        """Whether the message is still worth sending at time now."""
+        if self.listener is not None and self.listener.done():
+            return False
+        return self.expiry > now
+
+    def fail(self, exception):
+        """Fail the caller waiting for the response, if there is one."""
+        if self.listener is not None and not self.listener.done():
+            self.listener.set_exception(exception)
+
     @classmethod
     def from_bytes(cls, device, data, cipher=None):
         try:
@@ -598,7 +751,110 @@ class Message:
                 device._LOGGER.error(e)
                 raise MessageDecodeFailed() from e
 
-        return cls(command, payload, sequence)
+        return cls(command, payload, sequence, expect_response=False)
+
+
+class RttEstimator:
+    """Smoothed round-trip time and its variance, as TCP keeps them (RFC 6298).
+
+    The response timeout is the smoothed RTT plus four deviations, kept
+    between a floor and a ceiling. Until the first sample it is the
+    configured timeout; each timeout doubles it until a sample arrives.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+
+    def __init__(
+        self, initial, floor=MIN_RESPONSE_TIMEOUT, ceiling=MAX_RESPONSE_TIMEOUT
+    ):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.srtt = None
+        self.rttvar = None
+        self.samples = 0
+        self.timeout = min(max(initial, floor), ceiling)
+
+    def add_sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += self.BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += self.ALPHA * (rtt - self.srtt)
+        self.samples += 1
+        self.timeout = min(max(self.srtt + 4 * self.rttvar, self.floor), self.ceiling)
+
+    def backoff(self):
+        self.timeout = min(self.timeout * 2, self.ceiling)
+
+    def as_dict(self):
+        return {
+            "srtt_ms": None if self.srtt is None else round(self.srtt * 1000),
+            "rttvar_ms": None if self.rttvar is None else round(self.rttvar * 1000),
+            "timeout_ms": round(self.timeout * 1000),
+            "samples": self.samples,
+        }
+
+
+class CircuitBreaker:
+    """Stops sending to a device that keeps failing, probing it now and then.
+
+    Closed: requests flow. After more than FAILURE_THRESHOLD consecutive
+    failures it opens and rejects requests for a jittered, exponentially
+    growing delay. Once the delay is up the next request is let through as
+    the single half-open probe; a reply closes the breaker, a failure (or no
+    reply within MAX_RESPONSE_TIMEOUT) opens it again for longer. Failures
+    reported while open belong to requests sent before it opened and are
+    ignored.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold=FAILURE_THRESHOLD):
+        self.threshold = threshold
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.retry_at = 0
+        self.probe_at = 0
+
+    def allow(self, now):
+        """Whether a new request may be sent now; the first after opening probes."""
+        if self.state == self.HALF_OPEN and now - self.probe_at > MAX_RESPONSE_TIMEOUT:
+            self.record_failure(now)
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and now >= self.retry_at:
+            self.state = self.HALF_OPEN
+            self.probe_at = now
+            return True
+        return False
+
+    def retry_in(self, now):
+        return max(self.retry_at - now, 0)
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+
+    def record_failure(self, now):
+        if self.state == self.OPEN:
+            # requests that were already under way when it opened
+            return None
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures > self.threshold:
+            delay = min(INITIAL_BACKOFF * BACKOFF_MULTIPLIER**self.opened, MAX_BACKOFF)
+            # equal jitter, so devices that failed together retry apart
+            delay = delay / 2 + random.uniform(0, delay / 2)
+            self.state = self.OPEN
+            self.opened += 1
+            self.retry_at = now + delay
+            return delay
+        return None
 
 
 class TuyaDevice:
@@ -616,6 +872,8 @@ class TuyaDevice:
         port=6668,
         gateway_id=None,
         version=(3, 3),
+        connect_slots=None,
+        phase=0.0,
     ):
         """Initialize the device."""
         self._LOGGER = _LOGGER.getChild(device_id)
@@ -628,8 +886,20 @@ class TuyaDevice:
         self.gateway_id = gateway_id
         self.version = version
         self.timeout = timeout
+        self.rtt = RttEstimator(timeout)
+        # set from the reported state, so replies get time to wake the vacuum
+        self.asleep = False
+        self._ping_sent_at = None
+        self.last_ping = 0
         self.last_pong = 0
+        # any frame from the device proves the connection is alive
+        self.last_received = 0
         self.ping_interval = ping_interval
+        # shared limit on connects in progress, and this device's offset
+        # within each ping interval, so a fleet does not act in lockstep
+        self._connect_slots = connect_slots or contextlib.nullcontext()
+        self._connect_lock = asyncio.Lock()
+        self.phase = phase
         self.update_entity_state_cb = update_entity_state
 
         if len(local_key) != 16:
@@ -638,8 +908,8 @@ class TuyaDevice:
         self.cipher = TuyaCipher(local_key, self.version)
         self.writer = None
         self._response_task = None
-        self._recieve_task = None
         self._ping_task = None
+        self._reconnect_task = None
         self._handlers: dict[int, Callable[[Message], Coroutine]] = {
             Message.GRATUITOUS_UPDATE: self.async_gratuitous_update_state,
             Message.PING_COMMAND: self._async_pong_received,
@@ -648,12 +918,19 @@ class TuyaDevice:
         self._connected = False
         self._enabled = True
         self._queue = []
+        self._queue_counter = itertools.count()
+        self._pending_set = None
+        self._pending_set_timer = None
+        self._get_task = None
+        self.last_update = None
+        self.merged_writes = 0
+        self._queue_event = asyncio.Event()
         self._listeners = {}
-        self._backoff = False
-        self._queue_interval = INITIAL_QUEUE_TIME
-        self._failures = 0
+        self._handler_tasks = set()
+        self._sequence = 0
+        self.breaker = CircuitBreaker()
 
-        asyncio.create_task(self.process_queue())
+        self._queue_task = asyncio.create_task(self.process_queue())
 
     def __repr__(self):
         return "{}({!r}, {!r}, {!r}, {!r})".format(
@@ -668,75 +945,176 @@ class TuyaDevice:
         return "{} ({}:{})".format(self.device_id, self.host, self.port)
 
     async def process_queue(self):
-        if self._enabled is False:
-            return
+        """Send queued messages, sleeping until one is enqueued."""
+        while self._enabled:
+            self.expire_listeners(int(time.time()))
 
-        self.clean_queue()
+            message = self.next_message()
+            if message is None:
+                self._queue_event.clear()
+                await self._queue_event.wait()
+                continue
 
-        if len(self._queue) > 0:
             self._LOGGER.debug(
-                "Processing queue. Current length: {}".format(len(self._queue))
+                "Processing queue. Current length: {}".format(len(self._queue) + 1)
             )
+            if message is self._pending_set:
+                self._pending_set = None
+            if self.breaker.state == CircuitBreaker.OPEN:
+                # queued before the breaker opened
+                message.fail(self.unavailable_error())
+                continue
             try:
-                message = self._queue.pop(0)
                 await message.async_send()
-                self._failures = 0
-                self._queue_interval = INITIAL_QUEUE_TIME
-                self._backoff = False
             except Exception as e:
-                self._failures += 1
                 self._LOGGER.debug(
-                    "{} failures. Most recent: {}".format(self._failures, e)
+                    "{} failures. Most recent: {}".format(self.breaker.failures + 1, e)
                 )
-                if self._failures > 3:
-                    self._backoff = True
-                    self._queue_interval = min(
-                        INITIAL_BACKOFF * (BACKOFF_MULTIPLIER ** (self._failures - 4)),
-                        600,
-                    )
-                    self._LOGGER.warn(
-                        "{} failures, backing off for {} seconds".format(
-                            self._failures, self._queue_interval
-                        )
-                    )
+                self.record_failure()
+                message.fail(e)
+
+            await asyncio.sleep(INITIAL_QUEUE_TIME)
+
+    @property
+    def response_timeout(self):
+        """The RTT-based timeout, plus the wake-up allowance while asleep."""
+        if self.asleep:
+            return self.rtt.timeout + WAKE_ALLOWANCE
+        return self.rtt.timeout
+
+    def record_failure(self):
+        delay = self.breaker.record_failure(time.monotonic())
+        if delay is not None:
+            self._LOGGER.warning(
+                "{} failures, backing off for {:.0f} seconds".format(
+                    self.breaker.failures, delay
+                )
+            )
 
-        await asyncio.sleep(self._queue_interval)
-        asyncio.create_task(self.process_queue())
+    def unavailable_error(self):
+        return BackoffException(
+            "{} is not responding, retrying in {:.0f} seconds".format(
+                self, self.breaker.retry_in(time.monotonic())
+            )
+        )
+
+    def check_available(self):
+        """Raise BackoffException rather than send while the breaker is open."""
+        if not self.breaker.allow(time.monotonic()):
+            raise self.unavailable_error()
+
+    def enqueue(self, message):
+        priority = Message.QUEUE_PRIORITY.get(message.command, 1)
+        heapq.heappush(self._queue, (priority, next(self._queue_counter), message))
+        self._queue_event.set()
 
-    def clean_queue(self):
-        cleaned_queue = []
+    def next_message(self):
+        """Pop the most urgent unexpired message, failing expired ones.
+
+        Requests whose caller already gave up are dropped unsent.
+        """
         now = int(time.time())
-        for item in self._queue:
-            if item.expiry > now:
-                cleaned_queue.append(item)
-        self._queue = cleaned_queue
+        while self._queue:
+            _, __, message = heapq.heappop(self._queue)
+            if message.is_live(now):
+                return message
+            if message is self._pending_set:
+                # later writes must start a new SET, not merge into this one
+                self._pending_set = None
+            if message.listener is not None and message.listener.done():
+                # the caller stopped waiting, do not send it
+                continue
+            message.fail(
+                ResponseTimeoutException(
+                    "Sequence number {} expired before it was sent".format(
+                        message.sequence
+                    )
+                )
+            )
+        return None
+
+    def register_listener(self, message):
+        """Wait for the response to a request that is being written.
+
+        Entries expire with the message TTL, or the response timeout if that
+        is longer, and the table never holds more than MAX_LISTENERS.
+        """
+        if message.listener is None or message.sequence == 0:
+            # pongs carry sequence 0 and are matched by command instead
+            return
+        self._listeners.pop(message.sequence, None)
+        while len(self._listeners) >= MAX_LISTENERS:
+            sequence = next(iter(self._listeners))
+            self._listeners.pop(sequence).fail(
+                ResponseTimeoutException(
+                    "Too many requests waiting, dropped sequence number {}".format(
+                        sequence
+                    )
+                )
+            )
+        message.listener_expiry = max(
+            message.expiry, time.time() + self.response_timeout
+        )
+        self._listeners[message.sequence] = message
+
+    def expire_listeners(self, now):
+        for sequence, request in list(self._listeners.items()):
+            if request.listener_expiry < now:
+                del self._listeners[sequence]
+                request.fail(
+                    ResponseTimeoutException(
+                        "No response to sequence number {}".format(sequence)
+                    )
+                )
+
+    def next_sequence(self):
+        """Return the next request sequence number, skipping 0 used by pings."""
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF or 1
+        return self._sequence
 
     async def async_connect(self):
         if self._connected is True or self._enabled is False:
             return
 
-        sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_STREAM)
-        sock.settimeout(self.timeout)
-        self._LOGGER.debug("Connecting to {}".format(self))
-        try:
-            sock.connect((self.host, self.port))
-        except (socket.timeout, TimeoutError) as e:
-            self._dps[self.model_details.commands[RobovacCommand.ERROR]] = (
-                "CONNECTION_FAILED"
-            )
-            raise ConnectionTimeoutException("Connection timed out")
-        loop = asyncio.get_running_loop()
-        loop.create_connection
-        self.reader, self.writer = await asyncio.open_connection(sock=sock)
-        self._connected = True
-
-        if self._ping_task is None:
-            self._ping_task = asyncio.create_task(self.async_ping(self.ping_interval))
+        # concurrent callers wait for the connect in progress instead of
+        # opening a second socket and starting a second reader
+        async with self._connect_lock:
+            if self._connected is True or self._enabled is False:
+                return
+            try:
+                async with self._connect_slots:
+                    self._LOGGER.debug("Connecting to {}".format(self))
+                    async with asyncio.timeout(self.timeout):
+                        self.reader, self.writer = await asyncio.open_connection(
+                            self.host, self.port
+                        )
+            except TimeoutError as e:
+                self._dps[self.model_details.commands[RobovacCommand.ERROR]] = (
+                    "CONNECTION_FAILED"
+                )
+                raise ConnectionTimeoutException("Connection timed out") from e
+
+            sock = self.writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            self._connected = True
+
+            if self._ping_task is None:
+                self._ping_task = asyncio.create_task(
+                    self.async_ping(
+                        self.ping_interval, self.phase * self.ping_interval
+                    )
+                )
 
-        asyncio.create_task(self._async_handle_message())
+            self._response_task = asyncio.create_task(self._async_handle_message())
 
     async def async_disable(self):
         self._enabled = False
+        if self._queue_task is not None:
+            self._queue_task.cancel()
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
 
         await self.async_disconnect()
 
@@ -747,25 +1125,70 @@ class TuyaDevice:
         self._LOGGER.debug("Disconnected from {}".format(self))
         self._connected = False
         self.last_pong = 0
+        self.last_received = 0
 
         if self.writer is not None:
             self.writer.close()
-            await self.writer.wait_closed()
+            try:
+                await self.writer.wait_closed()
+            except OSError as e:
+                # the socket was reset; closing it is all that is left to do
+                self._LOGGER.debug("Error closing {}: {}".format(self, e))
 
         if self.reader is not None and not self.reader.at_eof():
             self.reader.feed_eof()
 
-    async def async_get(self):
+    async def async_get(self, max_age=None):
+        """Refresh the state, sharing one request between concurrent callers.
+
+        Returns the DPS values that changed. With max_age set, state received
+        less than max_age seconds ago is kept without a round-trip.
+        """
+        if (
+            max_age is not None
+            and self.last_update is not None
+            and time.monotonic() - self.last_update < max_age
+        ):
+            return {}
+
+        if self._get_task is None:
+            self.check_available()
+            self._get_task = asyncio.create_task(self._async_get())
+            self._get_task.add_done_callback(self._async_get_done)
+        return await asyncio.shield(self._get_task)
+
+    def _async_get_done(self, task):
+        self._get_task = None
+        if not task.cancelled():
+            # retrieve the exception so a GET nobody waits for is not logged
+            task.exception()
+
+    async def _async_get(self):
         payload = {"gwId": self.gateway_id, "devId": self.device_id}
         encrypt = False if self.version < (3, 3) else True
         message = Message(Message.GET_COMMAND, payload, encrypt=encrypt, device=self)
-        self._queue.append(message)
+        # the state read back must include writes made before the request
+        self.flush_pending_set()
+        self.enqueue(message)
         response = await self.async_recieve(message)
-        await self.async_update_state(response)
+        return await self.async_update_state(response)
 
     async def async_set(self, dps):
         t = int(time.time())
-        payload = {"devId": self.device_id, "uid": "", "t": t, "dps": dps}
+        if self._pending_set is not None and not self._pending_set.is_live(t):
+            self._pending_set = None
+        if self._pending_set is None or self.breaker.state == CircuitBreaker.OPEN:
+            # a write merged into a pending SET rides on a request already let
+            # through, such as the one probe a half-open breaker allows
+            self.check_available()
+        if self._pending_set is not None:
+            # merge into the SET that has not been sent yet, last write wins
+            self._pending_set.payload["t"] = t
+            self._pending_set.payload["dps"].update(dps)
+            self.merged_writes += 1
+            return
+
+        payload = {"devId": self.device_id, "uid": "", "t": t, "dps": dict(dps)}
         message = Message(
             Message.SET_COMMAND,
             payload,
@@ -773,16 +1196,45 @@ class TuyaDevice:
             device=self,
             expect_response=False,
         )
-        self._queue.append(message)
+        if self._pending_set_timer is not None:
+            # the SET it would have queued expired
+            self._pending_set_timer.cancel()
+        self._pending_set = message
+        self._pending_set_timer = asyncio.get_running_loop().call_later(
+            SET_COALESCE_TIME, self.flush_pending_set
+        )
 
-    async def async_ping(self, ping_interval):
+    def flush_pending_set(self):
+        """Queue the SET being coalesced now rather than when its window ends."""
+        if self._pending_set_timer is None:
+            return
+        self._pending_set_timer.cancel()
+        self._pending_set_timer = None
+        self.enqueue(self._pending_set)
+
+    def set_ping_interval(self, ping_interval):
+        """Ping at a new interval from now on, not after the current one ends."""
+        if ping_interval == self.ping_interval:
+            return
+        self.ping_interval = ping_interval
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            self._ping_task = asyncio.create_task(
+                self.async_ping(ping_interval, ping_interval)
+            )
+
+    async def async_ping(self, ping_interval, delay=0):
+        if delay:
+            await asyncio.sleep(delay)
         if self._enabled is False:
             return
 
-        if self._backoff is True:
-            self._LOGGER.debug("Currently in backoff, not adding ping to queue")
+        if time.monotonic() - self.last_received < ping_interval:
+            self._LOGGER.debug("Recent traffic from {}, skipping ping".format(self))
+        elif not self.breaker.allow(time.monotonic()):
+            self._LOGGER.debug("Circuit open, not adding ping to queue")
         else:
-            self.last_ping = time.time()
+            self.last_ping = time.monotonic()
             encrypt = False if self.version < (3, 3) else True
             message = Message(
                 Message.PING_COMMAND,
@@ -791,28 +1243,37 @@ class TuyaDevice:
                 device=self,
                 expect_response=False,
             )
-            self._queue.append(message)
+            self.enqueue(message)
 
         await asyncio.sleep(ping_interval)
         self._ping_task = asyncio.create_task(self.async_ping(self.ping_interval))
-        if self.last_pong < self.last_ping:
+        if self.last_received < self.last_ping:
             await self.async_disconnect()
 
     async def _async_pong_received(self, message):
-        self.last_pong = time.time()
+        self.last_pong = time.monotonic()
 
     async def async_gratuitous_update_state(self, state_message):
-        await self.async_update_state(state_message)
-        await self.update_entity_state_cb()
+        changed = await self.async_update_state(state_message)
+        if changed:
+            await self.update_entity_state_cb(changed)
 
     async def async_update_state(self, state_message, _=None):
+        """Merge received DPS into the state and return the ones that changed."""
+        changed = {}
         if (
             state_message is not None
             and state_message.payload
             and state_message.payload["dps"]
         ):
-            self._dps.update(state_message.payload["dps"])
-            self._LOGGER.debug("Received updated state {}: {}".format(self, self._dps))
+            dps = self._dps
+            for code, value in state_message.payload["dps"].items():
+                if code not in dps or dps[code] != value:
+                    changed[code] = value
+            dps.update(changed)
+            self.last_update = time.monotonic()
+            self._LOGGER.debug("Received updated state {}: {}".format(self, changed))
+        return changed
 
     @property
     def state(self):
@@ -822,52 +1283,105 @@ class TuyaDevice:
     def state_setter(self, new_values):
         asyncio.create_task(self.async_set(new_values))
 
+    def restore_state(self, dps):
+        """Seed the state with values saved earlier, without marking it fresh."""
+        self._dps.update(dps)
+
     async def _async_handle_message(self):
-        if self._enabled is False or self._connected is False:
-            return
+        # a newer connection may replace these while this loop winds down
+        reader = self.reader
+        task = asyncio.current_task()
+        buffer = MessageBuffer()
+        received = False
 
-        try:
-            self._response_task = asyncio.create_task(
-                self.reader.readuntil(MAGIC_SUFFIX_BYTES)
-            )
-            await self._response_task
-            response_data = self._response_task.result()
-            message = Message.from_bytes(self, response_data, self.cipher)
-        except Exception as e:
-            if isinstance(e, InvalidMessage):
-                self._LOGGER.debug("Invalid message from {}: {}".format(self, e))
-            elif isinstance(e, MessageDecodeFailed):
-                self._LOGGER.debug("Failed to decrypt message from {}".format(self))
-            elif isinstance(e, asyncio.IncompleteReadError):
-                if self._connected:
-                    self._LOGGER.debug("Incomplete read")
-            elif isinstance(e, ConnectionResetError):
+        while self._enabled is True and self._connected is True:
+            try:
+                data = await reader.read(READ_SIZE)
+            except OSError as e:
                 self._LOGGER.debug(
                     "Connection reset: {}\n{}".format(e, traceback.format_exc())
                 )
-                await self.async_disconnect()
+                data = None
+
+            if not data:
+                if self._connected and self.reader is reader:
+                    self._LOGGER.debug("Connection closed by {}".format(self))
+                    if not received:
+                        # accepting and then hanging up counts as a failure
+                        self.record_failure()
+                    await self._async_connection_lost()
+                break
+
+            received = True
+            for frame in buffer.feed(data):
+                try:
+                    message = Message.from_bytes(self, frame, self.cipher)
+                except InvalidMessage as e:
+                    self._LOGGER.debug("Invalid message from {}: {}".format(self, e))
+                except MessageDecodeFailed:
+                    self._LOGGER.debug("Failed to decrypt message from {}".format(self))
+                except Exception as e:
+                    # one unreadable frame must not stop the reader
+                    self._LOGGER.warning(
+                        "Unable to read message from {}: {}".format(self, e)
+                    )
+                else:
+                    self._dispatch_message(message)
 
-        else:
-            self._LOGGER.debug("Received message from {}: {}".format(self, message))
-            if message.sequence in self._listeners:
-                sem = self._listeners[message.sequence]
-                if isinstance(sem, asyncio.Semaphore):
-                    self._listeners[message.sequence] = message
-                    sem.release()
-            else:
-                handler = self._handlers.get(message.command, None)
-                if handler is not None:
-                    asyncio.create_task(handler(message))
+        if self._response_task is task:
+            self._response_task = None
 
-        self._response_task = None
-        asyncio.create_task(self._async_handle_message())
+    async def _async_connection_lost(self):
+        await self.async_disconnect()
+        if self._enabled and self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(self._async_reconnect())
+
+    async def _async_reconnect(self):
+        try:
+            await asyncio.sleep(RECONNECT_DELAY)
+            if self.breaker.state == CircuitBreaker.CLOSED:
+                await self.async_connect()
+        except Exception as e:
+            self._LOGGER.debug("Reconnect to {} failed: {}".format(self, e))
+            self.record_failure()
+        finally:
+            self._reconnect_task = None
+
+    def _dispatch_message(self, message):
+        self._LOGGER.debug("Received message from {}: {}".format(self, message))
+        now = self.last_received = time.monotonic()
+        self.breaker.record_success()
+        if message.command == Message.PING_COMMAND and self._ping_sent_at is not None:
+            self.rtt.add_sample(now - self._ping_sent_at)
+            self._ping_sent_at = None
+        request = self._listeners.pop(message.sequence, None)
+        if request is not None:
+            if request.sent_at is not None:
+                self.rtt.add_sample(now - request.sent_at)
+            if not request.listener.done():
+                request.listener.set_result(message)
+        else:
+            handler = self._handlers.get(message.command, None)
+            if handler is not None:
+                task = asyncio.create_task(handler(message))
+                # hold a reference until the handler finishes
+                self._handler_tasks.add(task)
+                task.add_done_callback(self._handler_tasks.discard)
 
     async def _async_send(self, message, retries=2):
         self._LOGGER.debug("Sending to {}: {}".format(self, message))
         try:
             await self.async_connect()
             self.writer.write(message.bytes())
+            self.register_listener(message)
             await self.writer.drain()
+            message.sent_at = time.monotonic()
+            if message.command == Message.PING_COMMAND:
+                self._ping_sent_at = message.sent_at
+            if message.deadline is not None and not message.deadline.expired():
+                message.deadline.reschedule(
+                    asyncio.get_running_loop().time() + self.response_timeout
+                )
         except Exception as e:
             if retries == 0:
                 if isinstance(e, socket.error):
@@ -900,26 +1414,25 @@ class TuyaDevice:
                     "Retrying send due to error. Failed to send data to {}".format(self)
                 )
             await asyncio.sleep(0.25)
+            if self.breaker.state == CircuitBreaker.OPEN:
+                # the reader gave up on the connection; wait out the backoff
+                raise self.unavailable_error() from e
             await self._async_send(message, retries=retries - 1)
 
     async def async_recieve(self, message):
         if message.expect_response is True:
             try:
-                self._recieve_task = asyncio.create_task(
-                    asyncio.wait_for(message.listener.acquire(), timeout=self.timeout)
-                )
-                await self._recieve_task
-                response = self._listeners.pop(message.sequence)
-
-                if isinstance(response, Exception):
-                    raise response
-
-                return response
+                # self.timeout bounds queueing and connecting; once the
+                # request is written the deadline follows the measured RTT
+                async with asyncio.timeout(self.timeout) as deadline:
+                    message.deadline = deadline
+                    return await message.listener
             except Exception as e:
-                del self._listeners[message.sequence]
                 await self.async_disconnect()
 
                 if isinstance(e, TimeoutError):
+                    self.rtt.backoff()
+                    self.record_failure()
                     raise ResponseTimeoutException(
                         "Timed out waiting for response to sequence number {}".format(
                             message.sequence
@@ -927,3 +1440,6 @@ class TuyaDevice:
                     )
 
                 raise e
+            finally:
+                message.deadline = None
+                self._listeners.pop(message.sequence, None)
@@ -17,21 +17,24 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
 import logging
 import asyncio
 import base64
 import json
 import time
 import ast
+import binascii
+import functools
 from typing import Any
 
 from homeassistant.components.vacuum import StateVacuumEntity, VacuumActivity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.const import (
     CONF_ACCESS_TOKEN,
     CONF_MODEL,
@@ -42,17 +45,16 @@ from homeassistant.const import (
     CONF_MAC,
 )
 
-from .vacuums.base import RoboVacEntityFeature, RobovacCommand
-from .tuyalocalapi import TuyaException
-from .const import CONF_VACS, DOMAIN, REFRESH_RATE, PING_RATE, TIMEOUT
+from .vacuums.base import RoboVacEntityFeature, RoboVacModel, RobovacCommand
+from .const import CONF_VACS, COORDINATORS, DOMAIN
+from .coordinator import RoboVacCoordinator
+from .robovac import decode_raw, friendly_text
+from .tuyalocalapi import BackoffException, CircuitBreaker
 from .errors import getErrorMessage
-from .robovac import ModelNotSupportedException, RoboVac
+from .protobuf import decode_dps, decode_message, decode_packed_varints, get_field
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=REFRESH_RATE)
-UPDATE_RETRIES = 3
-
 ATTR_ERROR = "error"
 ATTR_CLEANING_AREA = "cleaning_area"
 ATTR_CLEANING_TIME = "cleaning_time"
@@ -61,6 +63,26 @@ ATTR_DO_NOT_DISTURB = "do_not_disturb"
 ATTR_BOOST_IQ = "boost_iq"
 ATTR_CONSUMABLES = "consumables"
 ATTR_MODE = "mode"
+ATTR_CONNECTION = "connection"
+ATTR_UNKNOWN_DPS = "unknown_dps"
+ATTR_STATE_TIME = "state_time"
+ATTR_STATE_RESTORED = "state_restored"
+
+# what the connection attribute shows for each circuit breaker state
+CONNECTION_STATES = {
+    CircuitBreaker.CLOSED: "ok",
+    CircuitBreaker.OPEN: "backing_off",
+    CircuitBreaker.HALF_OPEN: "probing",
+}
+
+MAX_CONSUMABLES_SIZE = 4096
+CONSUMABLE_PARTS = {
+    "SB": "side_brush",
+    "RB": "rolling_brush",
+    "FM": "filter",
+    "SP": "sensors",
+    "SS": "side_sensors",
+}
 
 MODE_MAPPING = {
     "AggO": "Auto cleaning",
@@ -76,22 +98,19 @@ EMPTY_MAPPING = {
     "BBICEAE=": "Dry mop",
 }
 
-TUYA_STATUS_MAPPING = {
-    "BgoAEAUyAA==": "AUTO",
-    "BgoAEAVSAA==": "POSITION",
-    "CAoAEAUyAggB": "PAUSE",
-    "CAoCCAEQBTIA": "ROOM",
-    "CAoCCAEQBVIA": "ROOM_POSITION",
-    "CgoCCAEQBTICCAE=": "ROOM_PAUSE",
-    "CAoCCAIQBTIA": "SPOT",
-    "CAoCCAIQBVIA": "SPOT_POSITION",
-    "CgoCCAIQBTICCAE=": "SPOT_PAUSE",
-    "BAoAEAY=": "START_MANUAL",
-    "BBAHQgA=": "GOING_TO_CHARGE",
-    "BBADGgA=": "CHARGING",
-    "BhADGgIIAQ==": "COMPLETED",
-    "AA==": "STANDBY",
-    "AhAB": "SLEEPING",
+# L60 status (DPS 153) fields: 1 = clean target (1.1 is 1 for rooms, 2 for
+# spot), 2 = state, 3 = charging details (3.1 set once charging completed),
+# 6 = cleaning details (6.1 set while paused), 10 = positioning.
+L60_STATES = {
+    1: "SLEEPING",
+    6: "START_MANUAL",
+    7: "GOING_TO_CHARGE",
+}
+L60_CLEANING_STATES = {
+    # clean target: (cleaning, positioning, paused)
+    0: ("AUTO", "POSITION", "PAUSE"),
+    1: ("ROOM", "ROOM_POSITION", "ROOM_PAUSE"),
+    2: ("SPOT", "SPOT_POSITION", "SPOT_PAUSE"),
 }
 
 STATUS_MAPPING = {
@@ -112,14 +131,11 @@ STATUS_MAPPING = {
     "SLEEPING": "Sleeping",
 }
 
-ERROR_MAPPING = {
-    "DAiI6suO9dXszgFSAA==": "no_error",
-    "FAjwudWorOPszgEaAqURUgQSAqUR": "Sidebrush stuck",
-    "FAj+nMu7zuPszgEaAtg2UgQSAtg2": "Robot stuck",
-    "DAjtzbfps+XszgFSAA==": "no_error",
-    "DAiom9rd6eTszgFSAA==": "no_error",
-    "DAia8JTV5OPszgFSAA==": "no_error",
-    "DAj489bWsePszgFSAA==": "no_error",
+# L60 error (DPS 177) fields: 1 = timestamp, 3 = packed active error codes,
+# 10.2 = the same codes again.
+L60_ERROR_CODES = {
+    2213: "Sidebrush stuck",
+    7000: "Robot stuck",
 }
 
 
@@ -132,15 +148,15 @@ async def async_setup_entry(
     vacuums = config_entry.data[CONF_VACS]
     for item_key in vacuums:
         item = vacuums[item_key]
-        entity = RoboVacEntity(item)
+        coordinator = hass.data[DOMAIN][COORDINATORS][item[CONF_ID]]
+        entity = RoboVacEntity(coordinator, item)
         hass.data[DOMAIN][CONF_VACS][item[CONF_ID]] = entity
         async_add_entities([entity])
 
 
-class RoboVacEntity(StateVacuumEntity):
+class RoboVacEntity(CoordinatorEntity[RoboVacCoordinator], StateVacuumEntity):
     """Eufy Robovac L60 Vacuum entity."""
 
-    _attr_should_poll = True
     _attr_access_token: str | None = None
     _attr_ip_address: str | None = None
     _attr_model_code: str | None = None
@@ -153,11 +169,9 @@ class RoboVacEntity(StateVacuumEntity):
     _attr_mode: str | None = None
     _attr_robovac_supported: Any = None  # bitmask
 
-    def __init__(self, item: dict) -> None:
+    def __init__(self, coordinator: RoboVacCoordinator, item: dict) -> None:
         """Initialize Eufy Robovac L60."""
-        super().__init__()
-
-        self._battery_level_cache: int | None = None
+        super().__init__(coordinator)
 
         self._attr_name = item[CONF_NAME]
         self._attr_unique_id = item[CONF_ID]
@@ -165,36 +179,24 @@ class RoboVacEntity(StateVacuumEntity):
         self._attr_ip_address = item[CONF_IP_ADDRESS]
         self._attr_access_token = item[CONF_ACCESS_TOKEN]
 
-        self.update_failures = 0
         self._attr_available = True
 
-        try:
-            self.vacuum = RoboVac(
-                device_id=self.unique_id,
-                host=self.ip_address,
-                local_key=self.access_token,
-                timeout=TIMEOUT,
-                ping_interval=PING_RATE,
-                model_code=self.model_code[0:5],
-                update_entity_state=self.pushed_update_handler,
-            )
-            self.error_code = None
-        except ModelNotSupportedException:
+        self.vacuum = coordinator.vacuum
+        if self.vacuum is None:
             self.error_code = "UNSUPPORTED_MODEL"
-            # still define something sensible
-            self.vacuum = None  # type: ignore[assignment]
+        else:
+            self.error_code = None
 
         if self.error_code != "UNSUPPORTED_MODEL":
             self._attr_supported_features = self.vacuum.getHomeAssistantFeatures()
             self._attr_robovac_supported = self.vacuum.getRoboVacFeatures()
 
-            fan_speeds = self.vacuum.getFanSpeeds()
-            self.fan_speed_map: dict[str, str] = {}
-            for speed in fan_speeds:
-                self.fan_speed_map[friendly_text(speed)] = speed
-            self._attr_fan_speed_list = list(self.fan_speed_map.keys())
+            self._attr_fan_speed_list = [
+                friendly_text(speed) for speed in self.vacuum.getFanSpeeds()
+            ]
 
-            self._tuya_command_codes = self.vacuum.getCommandCodes()
+            self._dps_index = self.vacuum.dps_index
+            self._update_plan = compile_update_plan(self.vacuum.model_details)
 
         self._attr_mode = None
         self._attr_consumables = None
@@ -209,6 +211,7 @@ class RoboVacEntity(StateVacuumEntity):
 
         self.tuya_state: str | None = None
         self.tuyastatus: dict | None = None
+        self._last_visible: tuple | None = None
 
     # ---- Properties (keep your existing ones) ----
     @property
@@ -255,6 +258,10 @@ class RoboVacEntity(StateVacuumEntity):
     def ip_address(self) -> str | None:
         return self._attr_ip_address
 
+    @property
+    def available(self) -> bool:
+        return self._attr_available and super().available
+
     # ---- Modern state handling (VacuumActivity) ----
     @property
     def activity(self) -> VacuumActivity:
@@ -311,11 +318,23 @@ class RoboVacEntity(StateVacuumEntity):
         if self.mode:
             data[ATTR_MODE] = self.mode
 
+        if self.vacuum is not None:
+            data[ATTR_CONNECTION] = CONNECTION_STATES[self.vacuum.breaker.state]
+            # the codes only; their counts are in the diagnostics
+            if self.vacuum.unknown_dps:
+                data[ATTR_UNKNOWN_DPS] = sorted(self.vacuum.unknown_dps)
+
+        if self.coordinator.state_time is not None:
+            data[ATTR_STATE_TIME] = self.coordinator.state_time.isoformat()
+            data[ATTR_STATE_RESTORED] = self.coordinator.state_restored
+
         return data
 
-    # ---- Lifecycle / polling ----
+    # ---- Lifecycle / updates ----
     async def async_added_to_hass(self):
-        """Warm up a few polls so the entity comes up cleanly on restart."""
+        """Start warming up the vacuum; its state arrives through the coordinator."""
+        await super().async_added_to_hass()
+
         # If unsupported model, leave it unavailable
         if self.error_code == "UNSUPPORTED_MODEL":
             self._attr_available = False
@@ -327,149 +346,95 @@ class RoboVacEntity(StateVacuumEntity):
             self._attr_available = False
             return
 
-        for attempt in range(5):
-            try:
-                await self.async_forced_update()
-                self.update_failures = 0
-                self._attr_available = True
-                return
-            except Exception as err:
-                _LOGGER.debug("Startup refresh attempt %s failed: %s", attempt + 1, err)
-                await asyncio.sleep(1.5)
+        if self.coordinator.data:
+            # state restored from the last run
+            self.update_entity_values()
+        self.coordinator.async_start_warm_up()
 
-        self._attr_available = False
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Apply the latest state shared by the coordinator."""
+        if self.error_code == "UNSUPPORTED_MODEL" or not self.ip_address:
+            return
 
-    async def async_update(self):
-        """Synchronise state from the vacuum."""
-        try:
-            await self.async_update_vacuum()
-            self.update_failures = 0
+        if self.coordinator.last_update_success:
             self._attr_available = True
-        except TuyaException as e:
-            self.update_failures += 1
-            _LOGGER.warning(
-                "Update errored. Current update failure count: %s. Reason: %s",
-                self.update_failures,
-                e,
+            changed = self.coordinator.changed_codes
+            if self.error_code == "CONNECTION_FAILED":
+                # back from an outage: drop it and re-read every DPS, ERROR too
+                self.error_code = None
+                changed = None
+            self.update_entity_values(changed)
+            self.coordinator.async_set_activity(
+                self.activity, self.tuya_state == "Sleeping"
             )
-            if self.update_failures >= UPDATE_RETRIES:
-                self.error_code = "CONNECTION_FAILED"
-                self._attr_available = False
-
-    async def async_update_vacuum(self):
-        if self.error_code == "UNSUPPORTED_MODEL":
-            return
-        if not self.ip_address:
-            self.error_code = "IP_ADDRESS"
-            return
-
-        await self.vacuum.async_get()
-        self.update_entity_values()
+        else:
+            self.error_code = "CONNECTION_FAILED"
+
+        # skip the state write when nothing HA shows differs from the last write
+        visible_state = self._visible_state()
+        if visible_state != self._last_visible:
+            self._last_visible = visible_state
+            self.async_write_ha_state()
+
+    def _visible_state(self) -> tuple:
+        return (
+            self.available,
+            self.activity,
+            self.fan_speed,
+            self.extra_state_attributes,
+        )
 
     async def async_forced_update(self):
-        await self.async_update_vacuum()
-        self.async_write_ha_state()
+        await self.coordinator.async_force_refresh()
 
-    async def pushed_update_handler(self):
-        self.update_entity_values()
-        self.async_write_ha_state()
+    def update_entity_values(self, changed: set[str] | None = None):
+        """Re-read the attributes whose DPS changed, or all when changed is None."""
+        self.tuyastatus = self.coordinator.data
+        _LOGGER.debug("tuyastatus changed %s", changed)
 
-    def update_entity_values(self):
-        self.tuyastatus = self.vacuum._dps
-        _LOGGER.debug("tuyastatus %s", self.tuyastatus)
+        status = self.tuyastatus
+        if changed is None:
+            dps = status
+        else:
+            dps = {code: status.get(code) for code in changed}
+        plan = self._update_plan
+        for command, raw in self.vacuum.route_dps(dps).items():
+            for attribute, decoder in plan.get(command, ()):
+                value = decoder(raw)
+                setattr(self, attribute, value)
+                _LOGGER.debug("%s %s", attribute, value)
 
-        # Battery cache for sensor entity
-        raw_batt = self.tuyastatus.get(self._tuya_command_codes[RobovacCommand.BATTERY])
+    # ---- Commands ----
+    async def _async_set(self, dps: dict[str, Any]) -> None:
         try:
-            self._battery_level_cache = int(raw_batt) if raw_batt is not None else None
-        except (TypeError, ValueError):
-            self._battery_level_cache = None
-        _LOGGER.debug("_battery_level_cache %s", self._battery_level_cache)
-
-        self.tuya_state = STATUS_MAPPING.get(
-            TUYA_STATUS_MAPPING.get(
-                self.tuyastatus.get(self._tuya_command_codes[RobovacCommand.STATUS]), None
-            ),
-            None,
-        )
-        _LOGGER.debug("tuya_state %s", self.tuya_state)
+            await self.vacuum.async_set(dps)
+        except BackoffException as e:
+            raise HomeAssistantError(str(e)) from e
 
-        self.error_code = ERROR_MAPPING.get(
-            self.tuyastatus.get(self._tuya_command_codes[RobovacCommand.ERROR]), None
-        )
-        _LOGGER.debug("error_code %s", self.error_code)
-
-        self._attr_mode = self.tuyastatus.get(self._tuya_command_codes[RobovacCommand.MODE])
-        _LOGGER.debug("_attr_mode %s", self._attr_mode)
-
-        self._attr_fan_speed = friendly_text(
-            self.tuyastatus.get(self._tuya_command_codes[RobovacCommand.FAN_SPEED], "")
-        )
-        _LOGGER.debug("_attr_fan_speed %s", self._attr_fan_speed)
-
-        if self.robovac_supported & RoboVacEntityFeature.CLEANING_AREA:
-            self._attr_cleaning_area = self.tuyastatus.get(
-                self._tuya_command_codes[RobovacCommand.CLEANING_AREA]
-            )
-        _LOGGER.debug("_attr_cleaning_area %s", self._attr_cleaning_area)
-
-        if self.robovac_supported & RoboVacEntityFeature.CLEANING_TIME:
-            self._attr_cleaning_time = self.tuyastatus.get(
-                self._tuya_command_codes[RobovacCommand.CLEANING_TIME]
-            )
-        _LOGGER.debug("_attr_cleaning_time %s", self._attr_cleaning_time)
-
-        if self.robovac_supported & RoboVacEntityFeature.AUTO_RETURN:
-            self._attr_auto_return = self.tuyastatus.get(
-                self._tuya_command_codes[RobovacCommand.AUTO_RETURN]
-            )
-        _LOGGER.debug("_attr_auto_return %s", self._attr_auto_return)
-
-        if self.robovac_supported & RoboVacEntityFeature.DO_NOT_DISTURB:
-            self._attr_do_not_disturb = self.tuyastatus.get(
-                self._tuya_command_codes[RobovacCommand.DO_NOT_DISTURB]
-            )
-        _LOGGER.debug("_attr_do_not_disturb %s", self._attr_do_not_disturb)
-
-        if self.robovac_supported & RoboVacEntityFeature.BOOST_IQ:
-            self._attr_boost_iq = self.tuyastatus.get(
-                self._tuya_command_codes[RobovacCommand.BOOST_IQ]
-            )
-        _LOGGER.debug("_attr_boost_iq %s", self._attr_boost_iq)
-
-        if self.robovac_supported & RoboVacEntityFeature.CONSUMABLES:
-            raw = self.tuyastatus.get(self._tuya_command_codes[RobovacCommand.CONSUMABLES])
-            if raw:
-                consumables = ast.literal_eval(base64.b64decode(raw).decode("ascii"))
-                _LOGGER.debug("Consumables decoded value is: %s", consumables)
-                if "consumable" in consumables and "duration" in consumables["consumable"]:
-                    self._attr_consumables = consumables["consumable"]["duration"]
-        _LOGGER.debug("_attr_consumables %s", self._attr_consumables)
-
-    # ---- Commands ----
     async def async_locate(self, **kwargs):
         """Locate the vacuum cleaner."""
         _LOGGER.info("Locate Pressed")
-        code = self._tuya_command_codes[RobovacCommand.LOCATE]
+        code = self._dps_index.code(RobovacCommand.LOCATE)
         if self.tuyastatus and self.tuyastatus.get(code):
-            await self.vacuum.async_set({code: False})
+            await self._async_set({code: False})
         else:
-            await self.vacuum.async_set({code: True})
+            await self._async_set({code: True})
         asyncio.create_task(self.async_forced_update())
 
     async def async_return_to_base(self, **kwargs):
         """Return to dock."""
         _LOGGER.info("Return home Pressed")
-        await self.vacuum.async_set({self._tuya_command_codes[RobovacCommand.MODE]: "AggG"})
+        await self._async_set(self._dps_index.encode(RobovacCommand.MODE, "AggG"))
         asyncio.create_task(self.async_forced_update())
 
     async def async_start(self, **kwargs):
         """Start cleaning."""
-        await self.vacuum.async_set({self._tuya_command_codes[RobovacCommand.MODE]: "BBoCCAE="})
+        await self._async_set(self._dps_index.encode(RobovacCommand.MODE, "BBoCCAE="))
         asyncio.create_task(self.async_forced_update())
 
     async def async_pause(self, **kwargs):
-        await self.vacuum.async_set({self._tuya_command_codes[RobovacCommand.MODE]: "AggN"})
+        await self._async_set(self._dps_index.encode(RobovacCommand.MODE, "AggN"))
         asyncio.create_task(self.async_forced_update())
 
     async def async_stop(self, **kwargs):
@@ -479,14 +444,14 @@ class RoboVacEntity(StateVacuumEntity):
     async def async_clean_spot(self, **kwargs):
         """Perform a spot clean-up."""
         _LOGGER.info("Spot Clean Pressed")
-        await self.vacuum.async_set({self._tuya_command_codes[RobovacCommand.MODE]: "Spot"})
+        await self._async_set(self._dps_index.encode(RobovacCommand.MODE, "Spot"))
         asyncio.create_task(self.async_forced_update())
 
     async def async_set_fan_speed(self, fan_speed, **kwargs):
         """Set fan speed."""
         _LOGGER.info("Fan Speed Selected")
-        await self.vacuum.async_set(
-            {self._tuya_command_codes[RobovacCommand.FAN_SPEED]: self.fan_speed_map[fan_speed]}
+        await self._async_set(
+            self._dps_index.encode(RobovacCommand.FAN_SPEED, fan_speed)
         )
         asyncio.create_task(self.async_forced_update())
 
@@ -501,28 +466,28 @@ class RoboVacEntity(StateVacuumEntity):
         params = params or {}
 
         if command == "edgeClean":
-            await self.vacuum.async_set({"5": "Edge"})
+            await self._async_set({"5": "Edge"})
         elif command == "smallRoomClean":
-            await self.vacuum.async_set({"5": "SmallRoom"})
+            await self._async_set({"5": "SmallRoom"})
         elif command == "autoClean":
-            await self.vacuum.async_set({"152": "BBoCCAE="})
+            await self._async_set({"152": "BBoCCAE="})
         elif command == "autoReturn":
             if self.auto_return:
-                await self.vacuum.async_set({"135": False})
+                await self._async_set({"135": False})
             else:
-                await self.vacuum.async_set({"135": True})
+                await self._async_set({"135": True})
         elif command == "doNotDisturb":
             if self.do_not_disturb:
-                await self.vacuum.async_set({"139": "MEQ4MDAwMDAw"})
-                await self.vacuum.async_set({"107": False})
+                await self._async_set({"139": "MEQ4MDAwMDAw"})
+                await self._async_set({"107": False})
             else:
-                await self.vacuum.async_set({"139": "MTAwMDAwMDAw"})
-                await self.vacuum.async_set({"107": True})
+                await self._async_set({"139": "MTAwMDAwMDAw"})
+                await self._async_set({"107": True})
         elif command == "boostIQ":
             if self.boost_iq:
-                await self.vacuum.async_set({"118": False})
+                await self._async_set({"118": False})
             else:
-                await self.vacuum.async_set({"118": True})
+                await self._async_set({"118": True})
         elif command == "roomClean":
             roomIds = params.get("roomIds", [1])
             count = params.get("count", 1)
@@ -535,16 +500,190 @@ class RoboVacEntity(StateVacuumEntity):
             json_str = json.dumps(method_call, separators=(",", ":"))
             base64_str = base64.b64encode(json_str.encode("utf8")).decode("utf8")
             _LOGGER.info("roomClean call %s", json_str)
-            await self.vacuum.async_set({"124": base64_str})
+            await self._async_set({"124": base64_str})
         else:
-            await self.vacuum.async_set({command: params.get("value", "")})
+            await self._async_set({command: params.get("value", "")})
 
         asyncio.create_task(self.async_forced_update())
 
-    async def async_will_remove_from_hass(self):
-        if self.error_code != "UNSUPPORTED_MODEL" and self.vacuum is not None:
-            await self.vacuum.async_disable()
 
+@functools.lru_cache(maxsize=128)
+def _decode_status(value: str) -> str | None:
+    try:
+        fields = decode_dps(value)
+        state = get_field(fields, 2, 0)
+        if state == 0:
+            name = "STANDBY"
+        elif state == 3:
+            charging = decode_message(get_field(fields, 3, b""))
+            name = "COMPLETED" if get_field(charging, 1) else "CHARGING"
+        elif state == 5:
+            target = get_field(decode_message(get_field(fields, 1, b"")), 1, 0)
+            cleaning, positioning, paused = L60_CLEANING_STATES[target]
+            if 10 in fields:
+                name = positioning
+            elif get_field(decode_message(get_field(fields, 6, b"")), 1):
+                name = paused
+            else:
+                name = cleaning
+        else:
+            name = L60_STATES[state]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    return STATUS_MAPPING.get(name, None)
+
+
+def decode_status(value: Any) -> str | None:
+    """The L60 status name, decoded once per distinct raw value."""
+    if not isinstance(value, str):
+        return None
+    return _decode_status(value)
+
+
+@functools.lru_cache(maxsize=128)
+def _decode_error(value: str) -> str | int | None:
+    try:
+        fields = decode_dps(value)
+        codes = decode_packed_varints(get_field(fields, 3, b""))
+    except (TypeError, ValueError):
+        return None
+
+    if not codes:
+        return "no_error"
+    return L60_ERROR_CODES.get(codes[0], codes[0])
+
+
+def decode_error(value: Any) -> str | int | None:
+    """The first L60 error code, decoded once per distinct raw value."""
+    if not isinstance(value, str):
+        return None
+    return _decode_error(value)
+
+
+def decode_fan_speed(value: Any) -> str:
+    return friendly_text(value or "")
+
+
+def parse_literal(text: str) -> Any:
+    """Parse JSON, or a Python literal made only of dicts, lists and scalars."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    def convert(node: ast.AST) -> Any:
+        if isinstance(node, ast.Constant) and isinstance(
+            node.value, (str, int, float, bool, type(None))
+        ):
+            return node.value
+        if isinstance(node, ast.Dict):
+            return {convert(k): convert(v) for k, v in zip(node.keys, node.values)}
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [convert(item) for item in node.elts]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            value = convert(node.operand)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return -value
+        raise ValueError("Unsupported literal {}".format(type(node).__name__))
+
+    if len(text) > MAX_CONSUMABLES_SIZE:
+        raise ValueError("Literal too long")
+    return convert(ast.parse(text, mode="eval").body)
+
+
+@functools.lru_cache(maxsize=16)
+def _decode_consumables(value: str) -> tuple | None:
+    try:
+        consumables = parse_literal(base64.b64decode(value).decode("ascii"))
+    except (
+        binascii.Error,
+        RecursionError,
+        SyntaxError,
+        TypeError,
+        ValueError,
+    ) as e:
+        _LOGGER.debug("Unable to decode consumables %s: %s", value, e)
+        return None
+    _LOGGER.debug("Consumables decoded value is: %s", consumables)
+
+    try:
+        durations = consumables["consumable"]["duration"]
+    except (KeyError, TypeError):
+        return None
+    if not isinstance(durations, dict):
+        return None
+    return tuple(
+        (CONSUMABLE_PARTS.get(part, part), duration)
+        for part, duration in durations.items()
+    )
+
+
+def decode_consumables(value: Any) -> dict[str, Any] | None:
+    """Per-part consumable durations, decoded once per distinct raw value."""
+    if not value or not isinstance(value, str):
+        return None
+    durations = _decode_consumables(value)
+    return None if durations is None else dict(durations)
+
+
+# command, entity attribute, decoder, RoboVac feature the model needs (if any)
+UPDATE_ATTRIBUTES = (
+    (RobovacCommand.STATUS, "tuya_state", decode_status, None),
+    (RobovacCommand.ERROR, "error_code", decode_error, None),
+    (RobovacCommand.MODE, "_attr_mode", decode_raw, None),
+    (RobovacCommand.FAN_SPEED, "_attr_fan_speed", decode_fan_speed, None),
+    (
+        RobovacCommand.CLEANING_AREA,
+        "_attr_cleaning_area",
+        decode_raw,
+        RoboVacEntityFeature.CLEANING_AREA,
+    ),
+    (
+        RobovacCommand.CLEANING_TIME,
+        "_attr_cleaning_time",
+        decode_raw,
+        RoboVacEntityFeature.CLEANING_TIME,
+    ),
+    (
+        RobovacCommand.AUTO_RETURN,
+        "_attr_auto_return",
+        decode_raw,
+        RoboVacEntityFeature.AUTO_RETURN,
+    ),
+    (
+        RobovacCommand.DO_NOT_DISTURB,
+        "_attr_do_not_disturb",
+        decode_raw,
+        RoboVacEntityFeature.DO_NOT_DISTURB,
+    ),
+    (
+        RobovacCommand.BOOST_IQ,
+        "_attr_boost_iq",
+        decode_raw,
+        RoboVacEntityFeature.BOOST_IQ,
+    ),
+    (
+        RobovacCommand.CONSUMABLES,
+        "_attr_consumables",
+        decode_consumables,
+        RoboVacEntityFeature.CONSUMABLES,
+    ),
+)
+
+
+@functools.cache
+def compile_update_plan(model_details: RoboVacModel) -> dict[RobovacCommand, tuple]:
+    """Map each command a model reports to the (attribute, decoder) it feeds.
+
+    Built once per model, keeping only the attributes the model supports.
+    """
+    plan: dict[RobovacCommand, list] = {}
+    for command, attribute, decoder, feature in UPDATE_ATTRIBUTES:
+        if feature is not None and not model_details.robovac_features & feature:
+            continue
+        if command not in model_details.commands:
+            continue
+        plan.setdefault(command, []).append((attribute, decoder))
 
-def friendly_text(input: str) -> str:
-    return " ".join(word[0].upper() + word[1:] for word in input.replace("_", " ").split())
+    return {command: tuple(entries) for command, entries in plan.items()}
@@ -1,83 +1,35 @@
-from .T1250 import T1250
-from .T2103 import T2103
-from .T2117 import T2117
-from .T2118 import T2118
-from .T2119 import T2119
-from .T2120 import T2120
-from .T2123 import T2123
-from .T2128 import T2128
-from .T2130 import T2130
-from .T2132 import T2132
-from .T2150 import T2150
-from .T2181 import T2181
-from .T2182 import T2182
-from .T2190 import T2190
-from .T2192 import T2192
-from .T2193 import T2193
-from .T2194 import T2194
-from .T2250 import T2250
-from .T2251 import T2251
-from .T2252 import T2252
-from .T2253 import T2253
-from .T2254 import T2254
-from .T2255 import T2255
-from .T2256 import T2256
-from .T2257 import T2257
-from .T2258 import T2258
-from .T2259 import T2259
-from .T2261 import T2261
-from .T2262 import T2262
-from .T2266 import T2266
-from .T2267 import T2267
-from .T2270 import T2270
-from .T2272 import T2272
-from .T2273 import T2273
-from .T2275 import T2275
-from .T2276 import T2276
-from .T2277 import T2277
-from .T2278 import T2278
-from .T2320 import T2320
-from .T2351 import T2351
+"""Registry of supported RoboVac models.
 
-ROBOVAC_MODELS = {
-    "T2103": T2103,
-    "T2117": T2117,
-    "T2118": T2118,
-    "T2119": T2119,
-    "T2120": T2120,
-    "T2123": T2123,
-    "T2128": T2128,
-    "T2130": T2130,
-    "T2132": T2132,
-    "T1250": T1250,
-    "T2250": T2250,
-    "T2251": T2251,
-    "T2252": T2252,
-    "T2253": T2253,
-    "T2254": T2254,
-    "T2150": T2150,
-    "T2255": T2255,
-    "T2256": T2256,
-    "T2257": T2257,
-    "T2258": T2258,
-    "T2259": T2259,
-    "T2270": T2270,
-    "T2272": T2272,
-    "T2273": T2273,
-    "T2181": T2181,
-    "T2182": T2182,
-    "T2190": T2190,
-    "T2192": T2192,
-    "T2193": T2193,
-    "T2194": T2194,
-    "T2267": T2267,
-    "T2277": T2277,
-    "T2278": T2278,
-    "T2261": T2261,
-    "T2262": T2262,
-    "T2266": T2266,
-    "T2320": T2320,
-    "T2351": T2351,
-    "T2275": T2275,
-    "T2276": T2276,
-}
+The model specifications import Home Assistant, so they are only loaded the
+first time a model is looked up.
+"""
+
+from collections.abc import Mapping
+import importlib
+
+
+class LazyModelRegistry(Mapping):
+    """Read-only mapping of model code to RoboVacModel, loaded on demand."""
+
+    def __init__(self, module_name):
+        self._module_name = module_name
+        self._models = None
+
+    @property
+    def models(self):
+        if self._models is None:
+            module = importlib.import_module(self._module_name, __name__)
+            self._models = module.ROBOVAC_MODELS
+        return self._models
+
+    def __getitem__(self, model_code):
+        return self.models[model_code]
+
+    def __iter__(self):
+        return iter(self.models)
+
+    def __len__(self):
+        return len(self.models)
+
+
+ROBOVAC_MODELS = LazyModelRegistry(".models")
@@ -1,4 +1,7 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
 from enum import IntEnum, StrEnum
+from typing import Any
 
 
 class RoboVacEntityFeature(IntEnum):
@@ -33,3 +36,20 @@ class RobovacCommand(StrEnum):
     DO_NOT_DISTURB = "do_not_disturb"
     BOOST_IQ = "boost_iq"
     CONSUMABLES = "consumables"
+
+
+@dataclass(frozen=True, eq=False)
+class RoboVacModel:
+    """Immutable description of a RoboVac model.
+
+    Models of the same family share one read-only command map.
+    """
+
+    model_code: str
+    homeassistant_features: int
+    robovac_features: int
+    commands: Mapping[RobovacCommand, Any]
+
+
+class InvalidModelSpecification(Exception):
+    """A model specification is inconsistent."""
@@ -0,0 +1,319 @@
+"""Declarative specifications of the supported RoboVac models.
+
+Each family defines its command map once; a model is one line naming its
+family and feature flags. Everything is validated and frozen at import.
+"""
+
+from types import MappingProxyType
+
+from homeassistant.components.vacuum import VacuumEntityFeature
+
+from .base import (
+    InvalidModelSpecification,
+    RoboVacEntityFeature,
+    RoboVacModel,
+    RobovacCommand,
+)
+
+# ---- Command maps, one per family ----
+
+TUYA_COMMANDS = {
+    RobovacCommand.START_PAUSE: 2,
+    RobovacCommand.DIRECTION: {
+        "code": 3,
+        "values": ["forward", "back", "left", "right"],
+    },
+    RobovacCommand.MODE: {
+        "code": 5,
+        "values": ["auto", "SmallRoom", "Spot", "Edge", "Nosweep"],
+    },
+    RobovacCommand.STATUS: 15,
+    RobovacCommand.RETURN_HOME: 101,
+    RobovacCommand.LOCATE: 103,
+    RobovacCommand.BATTERY: 104,
+    RobovacCommand.ERROR: 106,
+    # These commands need codes adding
+    # RobovacCommand.CLEANING_AREA: 0,
+    # RobovacCommand.CLEANING_TIME: 0,
+    # RobovacCommand.AUTO_RETURN: 0,
+    # RobovacCommand.DO_NOT_DISTURB: 0,
+    # RobovacCommand.BOOST_IQ: 0,
+    # RobovacCommand.CONSUMABLES: 0,
+}
+
+
+def tuya_family(fan_speeds):
+    return {
+        **TUYA_COMMANDS,
+        RobovacCommand.FAN_SPEED: {"code": 102, "values": fan_speeds},
+    }
+
+
+NO_SUCTION_FAMILY = tuya_family(["No_suction", "Standard", "Boost_IQ", "Max"])
+BOOST_IQ_FAMILY = tuya_family(["Standard", "Turbo", "Max", "Boost_IQ"])
+QUIET_FAMILY = tuya_family(["Quiet", "Standard", "Turbo", "Max"])
+PURE_FAMILY = tuya_family(["Pure", "Standard", "Turbo", "Max"])
+
+L60_FAMILY = {
+    RobovacCommand.MODE: {  # works   (Start Auto and Return dock commands tested)
+        "code": 152,
+        "values": ["AggN", "AA==", "AggG", "BBoCCAE=", "AggO"],
+    },
+    RobovacCommand.STATUS: {  # works    (status only)
+        "code": 153,
+        "values": [
+            "BgoAEAUyAA===",
+            "BgoAEAVSAA===",
+            "CAoAEAUyAggB",
+            "CAoCCAEQBTIA",
+            "CAoCCAEQBVIA",
+            "CgoCCAEQBTICCAE=",
+            "CAoCCAIQBTIA",
+            "CAoCCAIQBVIA",
+            "CgoCCAIQBTICCAE=",
+            "BAoAEAY=",
+            "BBAHQgA=",
+            "BBADGgA=",
+            "BhADGgIIAQ==",
+            "AA==",
+            "AhAB",
+        ],
+    },
+    RobovacCommand.DIRECTION: {  # untested
+        "code": 155,
+        "values": ["Brake", "Forward", "Back", "Left", "Right"],
+    },
+    RobovacCommand.START_PAUSE: 156,  #   True, False           #works (status only)
+    RobovacCommand.DO_NOT_DISTURB: 157,  #   DgoAEgoKABICCBYaAggI  #untested
+    RobovacCommand.FAN_SPEED: {  # works (status and update)
+        "code": 158,
+        "values": ["Quiet", "Standard", "Turbo", "Max"],
+    },
+    RobovacCommand.BOOST_IQ: 159,  #   True, False           #works (status and update)
+    RobovacCommand.LOCATE: 160,  #   True, False           #works (status)
+    # Speaker volume: 161                                         #works, not yet implemented
+    RobovacCommand.BATTERY: 163,  #   int                   #works (status)
+    RobovacCommand.CONSUMABLES: 168,  # encrypted, not usable
+    RobovacCommand.RETURN_HOME: 173,  # encrypted, not usable
+    #   FgoQMggKAggBEgIQAToECgIIARICCAE=
+    #   FgoQMg4KAggBEggIARj/////DxICCAE=
+    #   FAoQMggKAggBEgIQAToECgIIARIA
+    #   GAoQMggKAggBEgIQAToECgIIARIECAE4AQ==
+    #   GgoQMggKAggBEgIQAToECgIIARIGCAEYATgB
+    RobovacCommand.ERROR: 177,  #                         #encrypted, few known values
+    #   SIDEBRUSH_STUCK: "FAjwudWorOPszgEaAqURUgQSAqUR"
+    #   ROBOT_STUCK: "FAj+nMu7zuPszgEaAtg2UgQSAtg2"
+    #   IQofCgIIAhICCAIaAggCKgIIAjoCCBugAe7Pqs6M1+zOAQ==
+    #   IQofCgIIAhICCAIaAggCKgIIAjoCCBqgAYPx0a331uzOAQ==
+    #   IQofCgIIBBICCAQaAggEKgIIBDoCCCmgAcSfs6Lo5uzOAQ==
+    # These commands need codes adding
+    # RobovacCommand.CLEANING_AREA: 0,
+    # RobovacCommand.CLEANING_TIME: 0,
+    # RobovacCommand.AUTO_RETURN: 0,
+    # Unknown: 151 (true/false)
+    # Unknown: 154
+    #    DgoKCgAaAggBIgIIARIA
+    #    DAoICgAaAggBIgASAA==
+    # Unknown: 164
+    #    MBoAIiwKBgi4y/q0BhIECAEQARoMCAESBBgJIB4aAgg+Kg4aDBIKCgIIARIAGgAiAA==
+    #    NAgGEAYaACIsCgYIuMv6tAYSBAgBEAEaDAgBEgQYCSAeGgIIPioOGgwSCgoCCAESABoAIgA=
+    # Unknown: 167
+    #    FAoAEgcIiEoQbhgEGgcI1EgQbBgC
+    #    FgoCEAESBwiIShBuGAQaBwjUSBBsGAI=
+    #    GAoECDwQARIHCIhKEG4YBBoHCNRIEGwYAg==
+    #    GQoFCLQBEAQSBwiIShBuGAQaBwjUSBBsGAI=
+    #    GwoFCKApEDgSCAiocxCmARgFGggI9HEQpAEYAw==
+    # Unknown: 171
+    #    AhAB
+    # Unknown: 176
+    #    MQoAGgBSCBoAIgIIASoAWDJiHwodChFBIG5ldHdvcmsgZm9yIHlvdRABGgYQ4/7/tAY=
+    #    LwoAGgBSCBoAIgIIASoAWFZiHQobChFBIG5ldHdvcmsgZm9yIHlvdRoGEPvagrUG
+    #    LwoAGgBSCBoAIgIIASoAWCJiHQobChFBIG5ldHdvcmsgZm9yIHlvdRoGEK2YgLUG
+    #    LwoAGgBSCBoAIgIIASoAWDBiHQobChFBIG5ldHdvcmsgZm9yIHlvdRoGEK2YgLUG
+    # Unknown: 178
+    #    DQjRidjfv9bszgESAR8=
+    #    DQiMrPbd+eLszgESAVU=
+    #    DQiW0dXL+uLszgESAR8=
+    #    Cgiv6NbWsePszgE=
+    #    DQjPuorb6eTszgESAR8=
+    #    DQjayd7nsOXszgESASg=
+    # Unknown: 179
+    #    EBIOKgwIBRACGAEgwYyAtQY=
+    #    FhIUEhIIBRABIFsowYyAtQYw74yAtQY=
+    #    DhIMKgoIBhgCIPvagrUG
+    #    DhIMKgoIBxgCIJLbgrUG
+    #    EBIOKgwIBxADGAIg3eyCtQY=
+    #    EBIOKgwIBxAEGAIgrPGCtQY=
+    #    DhIMKgoICBgCILHxgrUG
+    #    DhIMKgoICBADIIj6grUG
+    #    DhIMKgoICBADIOqMg7UG
+    #    DhIMKgoICBAEIOuMg7UG
+    #    DBIKKggICSCljYO1Bg==
+    #    DhIMKgoICRACIJmcg7UG
+    #    FhIUEhIICRABIBoomZyDtQYw6pyDtQY=
+    #    DhIMIgoICRABGO+cg7UG
+    #    DhIMIgoICRABGLedg7UG
+    #    IRIfCh0ICRgBMPvagrUGOMmdg7UGQKApSDhQO1gBYAdqAA==
+    # Unknown: 169
+    #    cwoSZXVmeSBDbGVhbiBMNjAgU0VTGhFDODpGRTowRjo3Nzo5NDo5QyIGMS4zLjI0KAVCKDM2NGFjOGNkNjQzZjllMDczZjg4NzlmNGFhOTdkZGE5OGUzMjg5NTRiFggBEgQIAhABGgQIAhABIgIIASoCCAE=
+    #    s \x12eufy Clean L60 SES\x1a\x11C8:FE:0F:77:94:9C"\x061.3.24(\x05B(364ac8cd643f9e073f8879f4aa97dda98e328954b\x16\x08\x01\x12\x04\x08\x02\x10\x01\x1a\x04\x08\x02\x10\x01"\x02\x08\x01*\x02\x08\x01
+}
+
+# ---- Feature sets ----
+
+HA_FEATURES = (
+    VacuumEntityFeature.BATTERY
+    | VacuumEntityFeature.FAN_SPEED
+    | VacuumEntityFeature.LOCATE
+    | VacuumEntityFeature.PAUSE
+    | VacuumEntityFeature.RETURN_HOME
+    | VacuumEntityFeature.SEND_COMMAND
+    | VacuumEntityFeature.START
+    | VacuumEntityFeature.STATE
+    | VacuumEntityFeature.STOP
+)
+HA_SPOT = HA_FEATURES | VacuumEntityFeature.CLEAN_SPOT
+HA_SPOT_MAP = HA_SPOT | VacuumEntityFeature.MAP
+
+# Tuya family models also report cleaning time and area, do not disturb,
+# auto return, Boost IQ and consumables, but those features can only be
+# declared once TUYA_COMMANDS has their DPS codes.
+RV_NONE = 0
+RV_EDGE = RoboVacEntityFeature.EDGE | RoboVacEntityFeature.SMALL_ROOM
+RV_ROOMS = (
+    RoboVacEntityFeature.ROOM | RoboVacEntityFeature.ZONE | RoboVacEntityFeature.MAP
+)
+RV_L60 = RoboVacEntityFeature.DO_NOT_DISTURB | RoboVacEntityFeature.BOOST_IQ
+
+# ---- Models: code -> (command family, Home Assistant features, RoboVac features) ----
+
+MODEL_SPECS = {
+    "T2103": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T2117": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T2118": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T2119": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T2120": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T2123": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T2128": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T2130": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T2132": (NO_SUCTION_FAMILY, HA_SPOT, RV_EDGE),
+    "T1250": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2250": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2251": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2252": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2253": (BOOST_IQ_FAMILY, HA_SPOT_MAP, RoboVacEntityFeature.MAP),
+    "T2254": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2150": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2255": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2256": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2257": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2258": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2259": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2270": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2272": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2273": (BOOST_IQ_FAMILY, HA_SPOT, RV_NONE),
+    "T2181": (QUIET_FAMILY, HA_SPOT_MAP, RV_ROOMS),
+    "T2182": (QUIET_FAMILY, HA_SPOT_MAP, RV_ROOMS),
+    "T2190": (QUIET_FAMILY, HA_SPOT_MAP, RV_ROOMS),
+    "T2192": (QUIET_FAMILY, HA_SPOT_MAP, RV_ROOMS),
+    "T2193": (QUIET_FAMILY, HA_SPOT_MAP, RV_ROOMS),
+    "T2194": (QUIET_FAMILY, HA_SPOT_MAP, RV_ROOMS),
+    "T2267": (L60_FAMILY, HA_FEATURES, RV_L60),
+    "T2277": (L60_FAMILY, HA_FEATURES, RV_L60),
+    "T2278": (L60_FAMILY, HA_FEATURES, RV_L60),
+    "T2261": (PURE_FAMILY, HA_SPOT_MAP, RV_ROOMS),
+    "T2262": (PURE_FAMILY, HA_SPOT_MAP, RV_ROOMS),
+    "T2266": (L60_FAMILY, HA_FEATURES, RV_L60),
+    "T2320": (L60_FAMILY, HA_FEATURES, RV_L60),
+    "T2351": (L60_FAMILY, HA_FEATURES, RV_L60),
+    "T2275": (L60_FAMILY, HA_FEATURES, RV_L60),
+    "T2276": (L60_FAMILY, HA_FEATURES, RV_L60),
+}
+
+# commands every model needs, and the ones each feature relies on
+REQUIRED_COMMANDS = (
+    RobovacCommand.MODE,
+    RobovacCommand.STATUS,
+    RobovacCommand.FAN_SPEED,
+    RobovacCommand.BATTERY,
+    RobovacCommand.ERROR,
+)
+FEATURE_COMMANDS = {
+    VacuumEntityFeature.BATTERY: RobovacCommand.BATTERY,
+    VacuumEntityFeature.FAN_SPEED: RobovacCommand.FAN_SPEED,
+    VacuumEntityFeature.LOCATE: RobovacCommand.LOCATE,
+    VacuumEntityFeature.STATE: RobovacCommand.STATUS,
+}
+ROBOVAC_FEATURE_COMMANDS = {
+    RoboVacEntityFeature.CLEANING_TIME: RobovacCommand.CLEANING_TIME,
+    RoboVacEntityFeature.CLEANING_AREA: RobovacCommand.CLEANING_AREA,
+    RoboVacEntityFeature.DO_NOT_DISTURB: RobovacCommand.DO_NOT_DISTURB,
+    RoboVacEntityFeature.AUTO_RETURN: RobovacCommand.AUTO_RETURN,
+    RoboVacEntityFeature.BOOST_IQ: RobovacCommand.BOOST_IQ,
+    RoboVacEntityFeature.CONSUMABLES: RobovacCommand.CONSUMABLES,
+}
+
+
+def freeze_commands(name, commands):
+    """Validate a family's command map and return a read-only copy."""
+    frozen = {}
+    codes = set()
+    for command, value in commands.items():
+        if isinstance(value, dict):
+            code = value["code"]
+            values = tuple(value["values"])
+            if not values or len(set(values)) != len(values):
+                raise InvalidModelSpecification(
+                    "{}: {} needs distinct values".format(name, command)
+                )
+            value = MappingProxyType({"code": code, "values": values})
+        else:
+            code = value
+        if code in codes:
+            raise InvalidModelSpecification(
+                "{}: DPS code {} is used twice".format(name, code)
+            )
+        codes.add(code)
+        frozen[command] = value
+
+    return MappingProxyType(frozen)
+
+
+def build_models(specs):
+    """Build the model table, sharing one frozen command map per family."""
+    families = {}
+    models = {}
+    for model_code, spec in specs.items():
+        commands, homeassistant_features, robovac_features = spec
+        frozen = families.get(id(commands))
+        if frozen is None:
+            frozen = families[id(commands)] = freeze_commands(model_code, commands)
+
+        for command in REQUIRED_COMMANDS:
+            if command not in frozen:
+                raise InvalidModelSpecification(
+                    "{}: missing {} command".format(model_code, command)
+                )
+        for features, feature_commands in (
+            (homeassistant_features, FEATURE_COMMANDS),
+            (robovac_features, ROBOVAC_FEATURE_COMMANDS),
+        ):
+            for feature, command in feature_commands.items():
+                if features & feature and command not in frozen:
+                    raise InvalidModelSpecification(
+                        "{}: feature {} needs the {} command".format(
+                            model_code, feature.name, command
+                        )
+                    )
+
+        models[model_code] = RoboVacModel(
+            model_code=model_code,
+            homeassistant_features=homeassistant_features,
+            robovac_features=robovac_features,
+            commands=frozen,
+        )
+
+    return models
+
+
+ROBOVAC_MODELS = build_models(MODEL_SPECS)
@@ -0,0 +1,45 @@
+"""Shared helpers for the Eufy Robovac L60 tests.
+
+The protocol tests (tuyalocalapi, protobuf) run without Home Assistant. The
+entity and model tests import it, and skip themselves when it is not
+installed; requirements_test.txt installs it.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.robovac.vacuums.base import RobovacCommand
+
+LOCAL_KEY = "0123456789abcdef"
+DEVICE_OPTIONS = {
+    "device_id": "abc",
+    "host": "127.0.0.1",
+    "local_key": LOCAL_KEY,
+    "timeout": 5,
+    "ping_interval": 10,
+    "update_entity_state": None,
+}
+
+
+@pytest.fixture
+def make_device():
+    """Build a bare TuyaDevice; call it inside a running event loop."""
+    from custom_components.robovac.tuyalocalapi import TuyaDevice
+
+    def make(**kwargs):
+        model_details = SimpleNamespace(commands={RobovacCommand.ERROR: 106})
+        return TuyaDevice(model_details, **{**DEVICE_OPTIONS, **kwargs})
+
+    return make
+
+
+@pytest.fixture
+def make_vacuum():
+    """Build an L60 RoboVac; call it inside a running event loop."""
+    from custom_components.robovac.robovac import RoboVac
+
+    def make(**kwargs):
+        return RoboVac("T2266", **{**DEVICE_OPTIONS, **kwargs})
+
+    return make
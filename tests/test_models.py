@@ -0,0 +1,41 @@
+"""Tests for the declarative model specifications."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.robovac.vacuums.base import (  # noqa: E402
+    InvalidModelSpecification,
+    RoboVacEntityFeature,
+)
+from custom_components.robovac.vacuums.models import (  # noqa: E402
+    HA_FEATURES,
+    L60_FAMILY,
+    MODEL_SPECS,
+    QUIET_FAMILY,
+    build_models,
+)
+
+
+def test_model_specs_are_valid():
+    assert build_models(MODEL_SPECS).keys() == MODEL_SPECS.keys()
+
+
+@pytest.mark.parametrize(
+    "feature",
+    [
+        RoboVacEntityFeature.CLEANING_TIME,
+        RoboVacEntityFeature.BOOST_IQ,
+        RoboVacEntityFeature.CONSUMABLES,
+    ],
+)
+def test_robovac_feature_without_command_is_rejected(feature):
+    with pytest.raises(InvalidModelSpecification, match=feature.name):
+        build_models({"T0000": (QUIET_FAMILY, HA_FEATURES, feature)})
+
+
+def test_robovac_feature_with_command_is_accepted():
+    models = build_models(
+        {"T0000": (L60_FAMILY, HA_FEATURES, RoboVacEntityFeature.BOOST_IQ)}
+    )
+    assert models["T0000"].robovac_features == RoboVacEntityFeature.BOOST_IQ
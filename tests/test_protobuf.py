@@ -0,0 +1,51 @@
+"""Tests for the protobuf wire-format decoder."""
+
+import pytest
+
+from custom_components.robovac.protobuf import (
+    ProtobufDecodeError,
+    decode_dps,
+    decode_message,
+    decode_packed_varints,
+    decode_varint,
+    get_field,
+)
+
+
+def test_decode_varint():
+    assert decode_varint(b"\x96\x01") == (150, 2)
+    with pytest.raises(ProtobufDecodeError):
+        decode_varint(b"\x96")
+
+
+def test_decode_message_keeps_repeated_and_nested_fields():
+    # field 1 varint 5, field 2 bytes {1: 1}, field 1 varint 7
+    fields = decode_message(b"\x08\x05\x12\x02\x08\x01\x08\x07")
+    assert fields[1] == (5, 7)
+    assert get_field(fields, 1) == 7
+    assert decode_message(get_field(fields, 2)) == {1: (1,)}
+    assert get_field(fields, 3, "missing") == "missing"
+
+
+def test_decode_packed_varints():
+    assert decode_packed_varints(b"\xa5\x11\xd8\x36") == (2213, 7000)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "not base64",
+        # length prefix larger than the message
+        "BRAD",
+        # truncated varint
+        "AYA=",
+    ],
+)
+def test_decode_dps_rejects_malformed_values(value):
+    with pytest.raises(ProtobufDecodeError):
+        decode_dps(value)
+
+
+def test_decode_dps():
+    # L60 "charging": state 3 with empty charging details
+    assert decode_dps("BBADGgA=") == {2: (3,), 3: (b"",)}
@@ -0,0 +1,37 @@
+"""Tests for the DPS index shared by a model's vacuums."""
+
+from collections import Counter
+
+from custom_components.robovac.robovac import DpsIndex
+from custom_components.robovac.vacuums.base import RobovacCommand
+
+COMMANDS = {
+    RobovacCommand.STATUS: 153,
+    RobovacCommand.FAN_SPEED: {"code": 158, "values": ["Standard", "Boost_IQ"]},
+    RobovacCommand.ERROR: 177,
+}
+
+
+def test_route_keys_values_by_command_and_counts_unknown_codes():
+    index = DpsIndex(COMMANDS)
+    unknown = Counter()
+    routed = index.route({"153": "AhAA", "158": "Standard", "169": "x"}, unknown)
+    assert routed == {
+        RobovacCommand.STATUS: "AhAA",
+        RobovacCommand.FAN_SPEED: "Standard",
+    }
+    assert unknown == {"169": 1}
+
+
+def test_route_skips_local_placeholders():
+    index = DpsIndex(COMMANDS)
+    unknown = Counter()
+    # a failed connect stores its error under the int code
+    assert index.route({177: "CONNECTION_FAILED"}, unknown) == {}
+    assert not unknown
+
+
+def test_encode_accepts_friendly_names():
+    index = DpsIndex(COMMANDS)
+    assert index.encode(RobovacCommand.FAN_SPEED, "Boost IQ") == {"158": "Boost_IQ"}
+    assert index.code(RobovacCommand.LOCATE) is None
@@ -0,0 +1,481 @@
+"""Tests for the Tuya local protocol client."""
+
+import asyncio
+import base64
+import random
+import socket
+import struct
+import time
+import tracemalloc
+import zlib
+
+import pytest
+from cryptography.hazmat.primitives.padding import PKCS7
+
+from custom_components.robovac import tuyalocalapi
+from custom_components.robovac.tuyalocalapi import (
+    FAILURE_THRESHOLD,
+    INITIAL_QUEUE_TIME,
+    MAGIC_PREFIX,
+    MAGIC_PREFIX_BYTES,
+    MAGIC_SUFFIX,
+    MAGIC_SUFFIX_BYTES,
+    MAX_LISTENERS,
+    MESSAGE_PREFIX_FORMAT,
+    MESSAGE_SUFFIX_FORMAT,
+    MIN_RESPONSE_TIMEOUT,
+    SET_COALESCE_TIME,
+    WAKE_ALLOWANCE,
+    BackoffException,
+    CircuitBreaker,
+    ConnectionTimeoutException,
+    Message,
+    MessageBuffer,
+    RttEstimator,
+    TuyaCipher,
+    crc,
+    table_crc,
+)
+
+from .conftest import LOCAL_KEY
+
+
+def make_frame(payload, sequence=1, command=Message.GRATUITOUS_UPDATE):
+    header = struct.pack(
+        MESSAGE_PREFIX_FORMAT, MAGIC_PREFIX, sequence, command, len(payload) + 8
+    )
+    suffix = struct.pack(MESSAGE_SUFFIX_FORMAT, crc(header + payload), MAGIC_SUFFIX)
+    return header + payload + suffix
+
+
+def test_set_after_expired_set_is_sent(make_device):
+    async def run():
+        device = make_device()
+        device._queue_task.cancel()
+
+        await device.async_set({"158": "Max"})
+        await asyncio.sleep(SET_COALESCE_TIME * 2)
+        device._pending_set.expiry = 0
+        # the expired SET is dropped from the queue, never sent
+        assert device.next_message() is None
+        assert device._pending_set is None
+
+        await device.async_set({"160": True})
+        await asyncio.sleep(SET_COALESCE_TIME * 2)
+        message = device.next_message()
+        assert message.payload["dps"] == {"160": True}
+        assert device.merged_writes == 0
+        await device.async_disable()
+
+    asyncio.run(run())
+
+
+def test_set_does_not_merge_into_expired_set(make_device):
+    async def run():
+        device = make_device()
+        device._queue_task.cancel()
+
+        await device.async_set({"158": "Max"})
+        device._pending_set.expiry = 0
+        await device.async_set({"160": True})
+        assert device.merged_writes == 0
+        assert device._pending_set.payload["dps"] == {"160": True}
+
+        await asyncio.sleep(SET_COALESCE_TIME * 2)
+        message = device.next_message()
+        assert message.payload["dps"] == {"160": True}
+        await device.async_disable()
+
+    asyncio.run(run())
+
+
+def test_refresh_after_a_command_is_sent_after_it(make_device):
+    async def run():
+        header_size = struct.calcsize(MESSAGE_PREFIX_FORMAT)
+        commands = []
+        both_sent = asyncio.Event()
+
+        async def serve(reader, writer):
+            while len(commands) < 2:
+                header = await reader.readexactly(header_size)
+                _, _, command, size = struct.unpack(MESSAGE_PREFIX_FORMAT, header)
+                await reader.readexactly(size)
+                if command != Message.PING_COMMAND:
+                    commands.append(command)
+            both_sent.set()
+            await reader.read()
+            writer.close()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        device = make_device(port=port)
+        await device.async_connect()
+        # let the first ping go out so the queue is idle
+        await asyncio.sleep(INITIAL_QUEUE_TIME * 2)
+
+        await device.async_set({"160": True})
+        refresh = asyncio.create_task(device.async_get())
+        await asyncio.wait_for(both_sent.wait(), 2)
+        assert commands == [Message.SET_COMMAND, Message.GET_COMMAND]
+        # the end of the coalescing window must not queue the SET again
+        await asyncio.sleep(SET_COALESCE_TIME * 2)
+        assert device.next_message() is None
+
+        refresh.cancel()
+        await device.async_disable()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_failures_while_open_do_not_extend_the_backoff():
+    breaker = CircuitBreaker(threshold=0)
+    delay = breaker.record_failure(0)
+    assert breaker.state == CircuitBreaker.OPEN
+    # a request sent before the breaker opened fails afterwards
+    assert breaker.record_failure(1) is None
+    assert breaker.opened == 1
+    assert breaker.failures == 1
+    assert breaker.retry_in(0) == delay
+
+
+def test_writes_merge_into_the_half_open_probe(make_device):
+    async def run():
+        device = make_device()
+        device._queue_task.cancel()
+        device.breaker.state = CircuitBreaker.OPEN
+
+        # the first write after the backoff is the probe
+        await device.async_set({"157": True})
+        assert device.breaker.state == CircuitBreaker.HALF_OPEN
+        await device.async_set({"158": "Max"})
+        assert device.merged_writes == 1
+        assert device._pending_set.payload["dps"] == {"157": True, "158": "Max"}
+
+        # anything that would be a second request still waits for the probe
+        with pytest.raises(BackoffException):
+            await device.async_get()
+        await device.async_disable()
+
+    asyncio.run(run())
+
+
+def test_fast_replies_keep_the_minimum_timeout():
+    rtt = RttEstimator(5)
+    for _ in range(20):
+        rtt.add_sample(0.02)
+    assert rtt.timeout == MIN_RESPONSE_TIMEOUT == 1
+
+
+def test_wake_allowance_applies_only_while_asleep(make_device):
+    async def run():
+        device = make_device()
+        for _ in range(20):
+            device.rtt.add_sample(0.02)
+        assert device.response_timeout == MIN_RESPONSE_TIMEOUT
+        device.asleep = True
+        assert device.response_timeout == MIN_RESPONSE_TIMEOUT + WAKE_ALLOWANCE
+        device.asleep = False
+        assert device.response_timeout == MIN_RESPONSE_TIMEOUT
+        await device.async_disable()
+
+    asyncio.run(run())
+
+
+def test_new_ping_interval_applies_at_once(make_device):
+    async def run():
+        device = make_device()
+        waiting = device._ping_task = asyncio.create_task(asyncio.sleep(10))
+
+        device.set_ping_interval(300)
+        await asyncio.sleep(0)
+        assert waiting.cancelled()
+        assert device.ping_interval == 300
+
+        restarted = device._ping_task
+        device.set_ping_interval(300)
+        assert device._ping_task is restarted
+        await device.async_disable()
+        restarted.cancel()
+
+    asyncio.run(run())
+
+
+def test_bad_frame_does_not_stop_the_reader(make_device):
+    async def run():
+        received = asyncio.get_running_loop().create_future()
+
+        async def update_entity_state(changed):
+            received.set_result(changed)
+
+        frames = []
+
+        async def serve(reader, writer):
+            writer.write(b"".join(frames))
+            await writer.drain()
+            await reader.read()
+            writer.close()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        device = make_device(port=port, update_entity_state=update_entity_state)
+        # a short SET payload that looks like a 3.3 prefix, then a real update
+        frames.append(
+            Message(Message.SET_COMMAND, b"3.3abcd", 1, device=device).bytes()
+        )
+        frames.append(
+            Message(
+                Message.GRATUITOUS_UPDATE,
+                {"dps": {"1": True}},
+                2,
+                encrypt=True,
+                device=device,
+            ).bytes()
+        )
+
+        await device.async_connect()
+        assert await asyncio.wait_for(received, 2) == {"1": True}
+        await device.async_disable()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_concurrent_connects_open_one_socket(make_device):
+    async def run():
+        accepted = []
+
+        async def serve(reader, writer):
+            accepted.append(writer)
+            await reader.read()
+            writer.close()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        device = make_device(port=port)
+
+        await asyncio.gather(*(device.async_connect() for _ in range(3)))
+        reader_task = device._response_task
+        await asyncio.sleep(0.1)
+        assert len(accepted) == 1
+        assert device._response_task is reader_task
+        await device.async_disable()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_connect_to_a_blackhole_does_not_block_the_loop(make_device):
+    # a listener that never accepts; once its backlog is full, further
+    # connection attempts get no answer at all
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(0)
+    port = listener.getsockname()[1]
+    fillers = []
+    for _ in range(4):
+        filler = socket.socket()
+        filler.setblocking(False)
+        filler.connect_ex(("127.0.0.1", port))
+        fillers.append(filler)
+
+    async def run():
+        lag = 0
+        done = False
+
+        async def tick():
+            nonlocal lag
+            while not done:
+                start = time.monotonic()
+                await asyncio.sleep(0.01)
+                lag = max(lag, time.monotonic() - start - 0.01)
+
+        ticker = asyncio.create_task(tick())
+        device = make_device(port=port, timeout=0.5)
+        try:
+            with pytest.raises(ConnectionTimeoutException):
+                await device.async_connect()
+        finally:
+            done = True
+            await ticker
+            await device.async_disable()
+        assert lag < 0.1
+
+    try:
+        asyncio.run(run())
+    finally:
+        for sock in fillers + [listener]:
+            sock.close()
+
+
+@pytest.mark.parametrize("reset", [False, True])
+def test_hang_ups_do_not_spin(make_device, monkeypatch, reset):
+    monkeypatch.setattr(tuyalocalapi, "RECONNECT_DELAY", 0.05)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        accepted = 0
+        created = 0
+
+        def counting_factory(loop, coro, **kwargs):
+            nonlocal created
+            created += 1
+            return asyncio.Task(coro, loop=loop, **kwargs)
+
+        async def serve(reader, writer):
+            nonlocal accepted
+            accepted += 1
+            if reset:
+                writer.get_extra_info("socket").setsockopt(
+                    socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+                )
+            writer.close()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        device = make_device(port=port)
+
+        loop.set_task_factory(counting_factory)
+        cpu = time.process_time()
+        await device.async_connect()
+        await asyncio.sleep(1)
+        cpu = time.process_time() - cpu
+        loop.set_task_factory(None)
+
+        # reconnects until the breaker opens, then waits out the backoff
+        assert device.breaker.state == device.breaker.OPEN
+        assert device.breaker.opened == 1
+        assert device._connected is False
+        assert accepted == FAILURE_THRESHOLD + 1
+        assert created < 10 * accepted
+        assert cpu < 0.5
+        await device.async_disable()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_lost_replies_do_not_grow_memory(make_device, monkeypatch):
+    monkeypatch.setattr(tuyalocalapi, "INITIAL_QUEUE_TIME", 0)
+
+    async def run():
+        async def serve(reader, writer):
+            # accept every request and never answer
+            while await reader.read(4096):
+                pass
+            writer.close()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        device = make_device(port=port)
+        payload = {"gwId": device.gateway_id, "devId": device.device_id}
+
+        async def requests(count):
+            for _ in range(count):
+                message = Message(
+                    Message.GET_COMMAND, payload, encrypt=True, device=device
+                )
+                device.enqueue(message)
+                while message.sent_at is None:
+                    await asyncio.sleep(0)
+                # the caller gives up waiting for the reply
+                message.listener.cancel()
+
+        await requests(500)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            await requests(2000)
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        assert len(device._listeners) <= MAX_LISTENERS
+        # at most the next heartbeat ping is waiting
+        assert len(device._queue) <= 1
+        growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        assert growth < 100_000
+        await device.async_disable()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_buffer_joins_split_frames():
+    frame = make_frame(b"x" * 40)
+    buffer = MessageBuffer()
+    assert buffer.feed(frame[:3]) == []
+    assert buffer.feed(frame[3:20]) == []
+    assert buffer.feed(frame[20:]) == [frame]
+    assert buffer.discarded == 0
+
+
+def test_buffer_returns_every_frame_in_one_read():
+    frames = [make_frame(bytes([n]) * n, sequence=n) for n in range(1, 6)]
+    buffer = MessageBuffer()
+    assert buffer.feed(b"".join(frames)) == frames
+
+
+def test_buffer_keeps_frames_whose_payload_holds_the_suffix():
+    frame = make_frame(b"ab" + MAGIC_SUFFIX_BYTES + b"cd")
+    assert MessageBuffer().feed(frame) == [frame]
+
+
+def test_buffer_skips_garbage():
+    frame = make_frame(b"payload")
+    buffer = MessageBuffer()
+    garbage = b"\x00\x01garbage" + MAGIC_PREFIX_BYTES[:2]
+    assert buffer.feed(garbage + frame + b"tail") == [frame]
+    assert buffer.discarded == len(garbage) + len(b"tail") - 3
+    assert buffer.feed(frame) == [frame]
+
+
+def test_buffer_resyncs_after_a_bogus_header():
+    frame = make_frame(b"payload")
+    # a prefix and a plausible payload size that never arrive
+    bogus = struct.pack(MESSAGE_PREFIX_FORMAT, MAGIC_PREFIX, 1, 8, 5000)
+    buffer = MessageBuffer()
+    assert buffer.feed(bogus + b"junk") == []
+    assert buffer.feed(frame) == [frame]
+    assert buffer.feed(frame + frame) == [frame, frame]
+
+
+def test_buffer_waits_for_a_large_frame():
+    frame = make_frame(bytes(3000))
+    buffer = MessageBuffer()
+    for start in range(0, len(frame) - 1000, 1000):
+        assert buffer.feed(frame[start : start + 1000]) == []
+    assert buffer.feed(frame[start + 1000 :]) == [frame]
+
+
+def test_crc_matches_the_table_implementation():
+    rng = random.Random(0)
+    assert crc is zlib.crc32
+    for size in list(range(64)) + [rng.randrange(64, 4096) for _ in range(200)]:
+        data = rng.randbytes(size)
+        assert crc(data) == table_crc(data)
+
+
+def reference_encrypt(cipher, data):
+    """Encrypt the way TuyaCipher did with a fresh context per message."""
+    padder = PKCS7(128).padder()
+    padded = padder.update(data) + padder.finalize()
+    encryptor = cipher.cipher.encryptor()
+    return encryptor.update(padded) + encryptor.finalize()
+
+
+def test_cipher_matches_the_padding_library():
+    rng = random.Random(0)
+    for version in ((3, 1), (3, 3)):
+        cipher = TuyaCipher(LOCAL_KEY, version)
+        for size in list(range(1, 40)) + [rng.randrange(40, 16384) for _ in range(50)]:
+            data = rng.randbytes(size)
+            encrypted = cipher.encrypt(Message.GET_COMMAND, data)
+            if version < (3, 3):
+                assert base64.b64decode(encrypted[19:]) == reference_encrypt(
+                    cipher, data
+                )
+            else:
+                assert encrypted == reference_encrypt(cipher, data)
+            assert cipher.decrypt(Message.GET_COMMAND, encrypted) == data
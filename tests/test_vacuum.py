@@ -0,0 +1,176 @@
+"""Tests for the vacuum entity and its DPS decoders."""
+
+import asyncio
+import base64
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import (  # noqa: E402
+    CONF_ACCESS_TOKEN,
+    CONF_DESCRIPTION,
+    CONF_ID,
+    CONF_IP_ADDRESS,
+    CONF_MAC,
+    CONF_MODEL,
+    CONF_NAME,
+)
+
+from custom_components.robovac.const import (  # noqa: E402
+    CONF_VACS,
+    COORDINATORS,
+    DOMAIN,
+)
+from custom_components.robovac.diagnostics import (  # noqa: E402
+    async_get_config_entry_diagnostics,
+)
+from custom_components.robovac.vacuum import (  # noqa: E402
+    RoboVacEntity,
+    decode_consumables,
+    decode_error,
+    decode_status,
+)
+
+from .conftest import LOCAL_KEY  # noqa: E402
+
+STANDBY = "AhAA"
+NO_ERROR = "AA=="
+
+
+def make_entity(vacuum):
+    coordinator = SimpleNamespace(
+        vacuum=vacuum,
+        data={"153": STANDBY, "177": NO_ERROR},
+        changed_codes=None,
+        last_update_success=True,
+        state_time=None,
+        state_restored=False,
+        async_set_activity=lambda activity, sleeping: None,
+    )
+    item = {
+        CONF_NAME: "L60",
+        CONF_ID: "abc",
+        CONF_MODEL: "T2266",
+        CONF_IP_ADDRESS: "127.0.0.1",
+        CONF_ACCESS_TOKEN: LOCAL_KEY,
+        CONF_DESCRIPTION: "RoboVac L60",
+        CONF_MAC: "00:00:00:00:00:00",
+    }
+    entity = RoboVacEntity(coordinator, item)
+    entity.writes = []
+    entity.async_write_ha_state = lambda: entity.writes.append(
+        (entity.available, entity.activity)
+    )
+    return entity
+
+
+def test_outage_and_recovery_are_written(make_vacuum):
+    async def run():
+        vacuum = make_vacuum()
+        entity = make_entity(vacuum)
+        coordinator = entity.coordinator
+
+        entity._handle_coordinator_update()
+        assert len(entity.writes) == 1
+        assert entity.writes[0][0] is True
+        assert entity.error_code == "no_error"
+        assert entity.extra_state_attributes["connection"] == "ok"
+
+        coordinator.last_update_success = False
+        entity._handle_coordinator_update()
+        assert len(entity.writes) == 2
+        assert entity.writes[-1][0] is False
+        assert entity.error_code == "CONNECTION_FAILED"
+
+        # the first good poll after the outage reports nothing changed
+        coordinator.last_update_success = True
+        coordinator.changed_codes = set()
+        entity._handle_coordinator_update()
+        assert len(entity.writes) == 3
+        assert entity.writes[-1] == entity.writes[0]
+        assert entity.error_code == "no_error"
+
+        # nothing visible changed since the last write
+        entity._handle_coordinator_update()
+        assert len(entity.writes) == 3
+        await vacuum.async_disable()
+
+    asyncio.run(run())
+
+
+def test_unknown_dps_are_reported(make_vacuum):
+    async def run():
+        vacuum = make_vacuum()
+        entity = make_entity(vacuum)
+        coordinator = entity.coordinator
+        # the connection error placeholder is not a DPS from the vacuum
+        coordinator.data = {**coordinator.data, "169": "x", 177: "CONNECTION_FAILED"}
+
+        entity._handle_coordinator_update()
+        assert entity.extra_state_attributes["unknown_dps"] == ["169"]
+
+        hass = SimpleNamespace(data={DOMAIN: {COORDINATORS: {"abc": coordinator}}})
+        entry = SimpleNamespace(data={CONF_VACS: {"abc": {CONF_MODEL: "T2266"}}})
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+        assert diagnostics["vacuums"]["abc"]["unknown_dps"] == {"169": 1}
+        await vacuum.async_disable()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("BgoAEAUyAA==", "Auto cleaning"),
+        ("CgoCCAEQBTICCAE=", "Cleaning room paused"),
+        ("BBADGgA=", "Charging"),
+        ("BhADGgIIAQ==", "Completed"),
+        ("AA==", "Standby"),
+        ("AhAB", "Sleeping"),
+        # varint where a nested message is expected
+        ("BBADGAE=", None),
+        ("BBAFCAE=", None),
+        ("not base64", None),
+        # unhashable values must not reach the cache
+        (["AhAA"], None),
+        ({"state": "AhAA"}, None),
+    ],
+)
+def test_decode_status(value, expected):
+    assert decode_status(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("DAiI6suO9dXszgFSAA==", "no_error"),
+        ("FAjwudWorOPszgEaAqURUgQSAqUR", "Sidebrush stuck"),
+        ("FAj+nMu7zuPszgEaAtg2UgQSAtg2", "Robot stuck"),
+        # varint where the packed error codes are expected
+        ("AhgF", None),
+        ("BBADGAE=", None),
+        ("not base64", None),
+        (["AA=="], None),
+        ({"error": "AA=="}, None),
+    ],
+)
+def test_decode_error(value, expected):
+    assert decode_error(value) == expected
+
+
+def test_decode_consumables_keeps_every_part():
+    raw = {"SB": 1, "RB": 2, "FM": 3, "SP": 4, "SS": 5, "XX": 6}
+    value = base64.b64encode(
+        json.dumps({"consumable": {"duration": raw}}).encode()
+    ).decode()
+    assert decode_consumables(value) == {
+        "side_brush": 1,
+        "rolling_brush": 2,
+        "filter": 3,
+        "sensors": 4,
+        "side_sensors": 5,
+        "XX": 6,
+    }